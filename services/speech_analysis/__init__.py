@@ -61,13 +61,13 @@ def analyze_creator_style(creator_id: str, config: AnalysisConfig = None) -> Sty
 
     # Get and process data
     transcript_data = db_manager.get_creator_transcript_data(creator_id)
-    processed_segments = preprocessor.process_transcript_data(transcript_data.segments)
+    processed_segments, segment_batch = preprocessor.process_transcript_batch(transcript_data.segments)
 
     # Generate profile
     creator_info = db_manager.get_creator_info(creator_id)
     creator_name = creator_info.get('display_name', creator_info.get('username', ''))
 
-    return profile_generator.generate_profile(creator_id, processed_segments, creator_name)
+    return profile_generator.generate_profile(creator_id, processed_segments, creator_name, segment_batch)
 
 
 def score_text_similarity(text: str, profile: StyleProfile, config: AnalysisConfig = None) -> StyleScore:
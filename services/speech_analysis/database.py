@@ -6,11 +6,12 @@ Handles data retrieval from Supabase and storage of style profiles.
 import os
 import json
 from typing import List, Dict, Optional, Tuple
-from dataclasses import asdict
+
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
 from speech_types import TranscriptSegment, CreatorTranscriptData, StyleProfile
+from sample_data import layout_sample_segments
 
 load_dotenv()
 
@@ -101,8 +102,8 @@ class DatabaseManager:
             print(f"✅ Mock mode: Saved style profile for {profile.creator_id}")
             return
 
-        # Convert profile to JSON
-        profile_json = asdict(profile)
+        # Convert profile to JSON-ready data (NumPy arrays become lists)
+        profile_json = profile.to_dict()
         print(f"✅ Generated style profile for {profile.creator_id}")
         print(f"   Profile confidence: {profile.confidence_score:.2%}")
         print(f"   Profile archetype: {profile.communication_archetype}")
@@ -260,29 +261,11 @@ class DatabaseManager:
             "That's all for today's tips! Make sure to hit that subscribe button if you found this helpful, and I'll see you in the next video!"
         ]
 
-        segments = []
-        start_time = 0.0
-
-        for i, text in enumerate(sample_texts):
-            # Estimate duration based on text length (roughly 2.5 words per second)
-            word_count = len(text.split())
-            duration = word_count / 2.5
-            end_time = start_time + duration
-
-            segment = TranscriptSegment(
-                video_id=f"mock_video_{(i // 3) + 1}",  # Group into videos
-                start_time=start_time,
-                end_time=end_time,
-                text=text,
-                confidence=0.95
-            )
-            segments.append(segment)
-
-            start_time = end_time + 1.0  # 1-second gap between segments
+        segments = layout_sample_segments(sample_texts, "mock_video")
 
         # Calculate totals
         total_videos = len(set(seg.video_id for seg in segments))
-        total_duration = sum(seg.end_time - seg.start_time for seg in segments)
+        total_duration = sum(seg.duration for seg in segments)
 
         return CreatorTranscriptData(
             creator_id=creator_id,
@@ -4,20 +4,49 @@ Handles lexical, syntactic, repetition, prosody, and persona features.
 """
 
 import re
+import sys
 import math
+import heapq
 from collections import Counter, defaultdict
-from typing import List, Dict, Tuple, Set, Optional
+from operator import itemgetter
+from typing import Iterable, List, Dict, Tuple, Set, Optional
 import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import spacy
+from spacy.parts_of_speech import NAMES as _POS_NAMES
 import textstat
 
 from speech_types import (
-    ProcessedSegment, LexicalFeatures, SyntaxFeatures, RepetitionFeatures,
-    ProsodyFeatures, PersonaFeatures, AnalysisConfig
+    ProcessedSegment, ProcessedSegmentBatch, LexicalFeatures, NGramScores, SyntaxFeatures, RepetitionFeatures,
+    ProsodyFeatures, PersonaFeatures, EnthusiasmMarkers, POVDistribution,
+    SentimentDistribution, SentenceLengthDistribution, SpeakingRateDistribution, PauseDistribution,
+    AnalysisConfig
 )
+from preprocess import get_spacy_nlp
+
+# Personal anecdote indicators, most frequent first so any() exits early
+_ANECDOTE_INDICATORS_ORDERED = (
+    'for me', 'i learned', 'personally', 'i remember', 'i used to',
+    'when i was', 'i found that', 'my experience', 'i discovered',
+    'in my case'
+)
+
+# Call-to-action phrases, most frequent first
+_CTA_PHRASES_ORDERED = (
+    'check out', 'let me know', 'subscribe', 'click', 'go to', 'tell me',
+    'comment below', 'try this', 'download', 'visit', 'like this video',
+    'hit that like button', 'give it a try', 'follow me'
+)
+
+_ENTHUSIASM_WORDS = ('excited', 'thrilled', 'pumped', 'stoked', 'psyched')
+
+_CAPS_RE = re.compile(r'\b[A-Z]{2,}\b')
+
+# Universal POS tag names indexed by spaCy's integer tag id. Interned, so every
+# pos_distribution shares the same key objects instead of fresh copies of token.pos_
+_POS_TAGS = tuple(sys.intern(_POS_NAMES.get(pos, '')) for pos in range(max(_POS_NAMES) + 1))
 
 
 class FeatureExtractor:
@@ -25,7 +54,7 @@ class FeatureExtractor:
 
     def __init__(self, config: AnalysisConfig):
         self.config = config
-        self.nlp = self._load_spacy_model()
+        self.nlp = get_spacy_nlp()
 
         # Initialize specialized extractors
         self.lexical_extractor = LexicalAnalyzer(config, self.nlp)
@@ -34,21 +63,12 @@ class FeatureExtractor:
         self.prosody_extractor = ProsodyAnalyzer(config)
         self.persona_extractor = PersonaAnalyzer(config, self.nlp)
 
-    def _load_spacy_model(self) -> spacy.Language:
-        """Load spaCy model for NLP processing."""
-        try:
-            return spacy.load("en_core_web_sm")
-        except OSError:
-            raise RuntimeError(
-                "spaCy English model not found. Install with: "
-                "python -m spacy download en_core_web_sm"
-            )
-
-    def extract_all_features(self, segments: List[ProcessedSegment]) -> Tuple[
+    def extract_all_features(self, segments: List[ProcessedSegment],
+                             batch: Optional[ProcessedSegmentBatch] = None) -> Tuple[
         LexicalFeatures, SyntaxFeatures, RepetitionFeatures,
         ProsodyFeatures, PersonaFeatures
     ]:
-        """Extract all feature types from processed segments."""
+        """Extract all feature types from processed segments (and their batch columns, if already built)."""
         if not segments:
             raise ValueError("No segments provided for feature extraction")
 
@@ -62,7 +82,7 @@ class FeatureExtractor:
         lexical = self.lexical_extractor.extract_features(all_text, segments)
         syntax = self.syntax_extractor.extract_features(all_sentences, segments)
         repetition = self.repetition_extractor.extract_features(segments)
-        prosody = self.prosody_extractor.extract_features(segments)
+        prosody = self.prosody_extractor.extract_features(segments, batch)
         persona = self.persona_extractor.extract_features(all_text, segments)
 
         return lexical, syntax, repetition, prosody, persona
@@ -137,7 +157,7 @@ class LexicalAnalyzer:
             rare_word_frequency=rare_word_freq
         )
 
-    def _extract_ngrams(self, text: str, n: int, top_k: int) -> List[Tuple[str, float]]:
+    def _extract_ngrams(self, text: str, n: int, top_k: int) -> NGramScores:
         """Extract top n-grams with PMI scoring."""
         # Create n-gram vectorizer
         vectorizer = CountVectorizer(
@@ -153,22 +173,17 @@ class LexicalAnalyzer:
             frequencies = ngram_matrix.toarray()[0]
 
             # Calculate PMI scores (simplified version)
-            total_ngrams = sum(frequencies)
-            ngram_scores = []
-
-            for i, ngram in enumerate(feature_names):
-                freq = frequencies[i]
-                if freq > 1:  # Only consider n-grams that appear more than once
-                    # Simple frequency-based scoring (in production, use proper PMI)
-                    score = freq / total_ngrams
-                    ngram_scores.append((ngram, score))
+            total_ngrams = frequencies.sum()
+            candidates = np.flatnonzero(frequencies > 1)  # Only n-grams that appear more than once
+            # Simple frequency-based scoring (in production, use proper PMI)
+            scores = frequencies[candidates] / total_ngrams
 
-            # Sort by score and return top k
-            ngram_scores.sort(key=lambda x: x[1], reverse=True)
-            return ngram_scores[:top_k]
+            # Top k by score; the stable sort keeps vocabulary order among ties
+            order = np.argsort(-scores, kind='stable')[:top_k]
+            return NGramScores(feature_names[candidates[order]].tolist(), scores[order])
 
         except Exception:
-            return []
+            return NGramScores()
 
     def _calculate_filler_frequency(self, tokens: List[str]) -> Dict[str, float]:
         """Calculate frequency of filler words."""
@@ -232,27 +247,20 @@ class LexicalAnalyzer:
         if len(words) < 50:  # MTLD requires sufficient text
             return 0.0
 
-        def mtld_calc(word_list: List[str], threshold: float = 0.72) -> float:
-            """Calculate MTLD for a word list."""
-            if not word_list:
-                return 0.0
-
-            ttr_values = []
+        def mtld_calc(word_iter: Iterable[str], total: int, threshold: float = 0.72) -> float:
+            """Calculate MTLD for a word sequence of the given length."""
             types = set()
 
-            for i, word in enumerate(word_list, 1):
+            for i, word in enumerate(word_iter, 1):
                 types.add(word)
-                ttr = len(types) / i
-                ttr_values.append(ttr)
-
-                if ttr <= threshold:
+                if len(types) / i <= threshold:
                     return i
 
-            return len(word_list)
+            return total
 
-        # Calculate forward and backward MTLD
-        forward_mtld = mtld_calc(words)
-        backward_mtld = mtld_calc(words[::-1])
+        # Calculate forward and backward MTLD; the backward pass reads the list in place
+        forward_mtld = mtld_calc(words, len(words))
+        backward_mtld = mtld_calc(reversed(words), len(words))
 
         return (forward_mtld + backward_mtld) / 2
 
@@ -325,7 +333,7 @@ class SyntaxAnalyzer:
         return SyntaxFeatures(
             mean_sentence_length=0.0,
             sentence_length_variance=0.0,
-            sentence_length_distribution={},
+            sentence_length_distribution=SentenceLengthDistribution.empty(),
             pos_distribution={},
             pronoun_frequency=0.0,
             imperative_frequency=0.0,
@@ -335,31 +343,28 @@ class SyntaxAnalyzer:
             list_usage_frequency=0.0
         )
 
-    def _categorize_sentence_lengths(self, lengths: List[int]) -> Dict[str, float]:
+    def _categorize_sentence_lengths(self, lengths: List[int]) -> SentenceLengthDistribution:
         """Categorize sentences by length."""
         if not lengths:
-            return {"short": 0.0, "medium": 0.0, "long": 0.0}
+            return SentenceLengthDistribution.empty()
 
         total = len(lengths)
         short = sum(1 for l in lengths if l <= 8)
         long = sum(1 for l in lengths if l >= 20)
         medium = total - short - long
 
-        return {
-            "short": short / total,
-            "medium": medium / total,
-            "long": long / total
-        }
+        return SentenceLengthDistribution(np.array([short, medium, long], dtype=np.float64) / total)
 
     def _calculate_pos_distribution(self, doc: spacy.tokens.Doc) -> Dict[str, float]:
         """Calculate POS tag distribution."""
-        pos_counts = Counter(token.pos_ for token in doc if not token.is_space)
+        # Count integer tag ids; names are looked up once per distinct tag
+        pos_counts = Counter(token.pos for token in doc if not token.is_space)
         total = sum(pos_counts.values())
 
         if total == 0:
             return {}
 
-        return {pos: count / total for pos, count in pos_counts.items()}
+        return {_POS_TAGS[pos]: count / total for pos, count in pos_counts.items()}
 
     def _calculate_pronoun_frequency(self, doc: spacy.tokens.Doc) -> float:
         """Calculate pronoun frequency."""
@@ -622,12 +627,11 @@ class RepetitionAnalyzer:
 
     def _find_signature_expressions(self, recurring_phrases: Dict[str, int]) -> List[str]:
         """Identify signature expressions from recurring phrases."""
-        # Sort by frequency and uniqueness
-        sorted_phrases = sorted(recurring_phrases.items(),
-                              key=lambda x: x[1], reverse=True)
+        # Most frequent phrases first
+        top_phrases = heapq.nlargest(10, recurring_phrases.items(), key=itemgetter(1))
 
         signature_phrases = []
-        for phrase, count in sorted_phrases[:10]:  # Top 10
+        for phrase, count in top_phrases:  # Top 10
             if count >= 3 and len(phrase.split()) >= 2:
                 signature_phrases.append(phrase)
 
@@ -640,26 +644,31 @@ class ProsodyAnalyzer:
     def __init__(self, config: AnalysisConfig):
         self.config = config
 
-    def extract_features(self, segments: List[ProcessedSegment]) -> ProsodyFeatures:
+    def extract_features(self, segments: List[ProcessedSegment],
+                         batch: Optional[ProcessedSegmentBatch] = None) -> ProsodyFeatures:
         """Extract prosodic features from timing data."""
         if not segments:
             return self._empty_prosody_features()
 
+        # All statistics are reductions over the timing columns
+        if batch is None:
+            batch = ProcessedSegmentBatch.from_segments(segments)
+
         # Calculate speaking rate metrics
-        wpm_values = [seg.words_per_minute for seg in segments if seg.words_per_minute > 0]
-        mean_wpm = np.mean(wpm_values) if wpm_values else 0
-        wpm_variance = np.var(wpm_values) if wpm_values else 0
+        wpm_values = batch.wpm[batch.wpm > 0]
+        mean_wpm = np.mean(wpm_values) if wpm_values.size else 0
+        wpm_variance = np.var(wpm_values) if wpm_values.size else 0
         wpm_dist = self._categorize_speaking_rate(wpm_values)
 
         # Calculate pause metrics
-        pauses = [seg.pause_after for seg in segments if seg.pause_after > 0]
-        pause_freq = len(pauses) / len(segments) if segments else 0
-        mean_pause = np.mean(pauses) if pauses else 0
+        pauses = batch.pause_after[batch.pause_after > 0]
+        pause_freq = pauses.size / len(batch)
+        mean_pause = np.mean(pauses) if pauses.size else 0
         pause_dist = self._categorize_pauses(pauses)
 
         # Calculate rhythm and flow metrics
-        continuity_score = self._calculate_speech_continuity(segments)
-        rhythm_regularity = self._calculate_rhythm_regularity(segments)
+        continuity_score = self._calculate_speech_continuity(batch)
+        rhythm_regularity = self._calculate_rhythm_regularity(batch)
 
         return ProsodyFeatures(
             mean_words_per_minute=mean_wpm,
@@ -677,65 +686,56 @@ class ProsodyAnalyzer:
         return ProsodyFeatures(
             mean_words_per_minute=0.0,
             wpm_variance=0.0,
-            speaking_rate_distribution={},
+            speaking_rate_distribution=SpeakingRateDistribution.empty(),
             pause_frequency=0.0,
             mean_pause_duration=0.0,
-            pause_distribution={},
+            pause_distribution=PauseDistribution.empty(),
             speech_continuity_score=0.0,
             rhythm_regularity=0.0
         )
 
-    def _categorize_speaking_rate(self, wpm_values: List[float]) -> Dict[str, float]:
+    def _categorize_speaking_rate(self, wpm_values: np.ndarray) -> SpeakingRateDistribution:
         """Categorize speaking rate into slow/normal/fast."""
-        if not wpm_values:
-            return {"slow": 0.0, "normal": 0.0, "fast": 0.0}
+        if not wpm_values.size:
+            return SpeakingRateDistribution.empty()
 
-        total = len(wpm_values)
-        slow = sum(1 for wpm in wpm_values if wpm < 120)
-        fast = sum(1 for wpm in wpm_values if wpm > 180)
+        total = wpm_values.size
+        slow = np.count_nonzero(wpm_values < 120)
+        fast = np.count_nonzero(wpm_values > 180)
         normal = total - slow - fast
 
-        return {
-            "slow": slow / total,
-            "normal": normal / total,
-            "fast": fast / total
-        }
+        return SpeakingRateDistribution(np.array([slow, normal, fast], dtype=np.float64) / total)
 
-    def _categorize_pauses(self, pauses: List[float]) -> Dict[str, float]:
+    def _categorize_pauses(self, pauses: np.ndarray) -> PauseDistribution:
         """Categorize pauses by duration."""
-        if not pauses:
-            return {"short": 0.0, "medium": 0.0, "long": 0.0}
+        if not pauses.size:
+            return PauseDistribution.empty()
 
-        total = len(pauses)
-        short = sum(1 for p in pauses if p < 1.0)
-        long = sum(1 for p in pauses if p > 3.0)
+        total = pauses.size
+        short = np.count_nonzero(pauses < 1.0)
+        long = np.count_nonzero(pauses > 3.0)
         medium = total - short - long
 
-        return {
-            "short": short / total,
-            "medium": medium / total,
-            "long": long / total
-        }
+        return PauseDistribution(np.array([short, medium, long], dtype=np.float64) / total)
 
-    def _calculate_speech_continuity(self, segments: List[ProcessedSegment]) -> float:
+    def _calculate_speech_continuity(self, batch: ProcessedSegmentBatch) -> float:
         """Calculate how continuous the speech is."""
-        if len(segments) < 2:
+        if len(batch) < 2:
             return 1.0
 
         # Calculate ratio of speaking time to total time
-        total_speech_time = sum(seg.original.duration for seg in segments)
-        total_time = (segments[-1].original.end_time -
-                     segments[0].original.start_time)
+        total_speech_time = float(batch.durations.sum())
+        total_time = float(batch.end_times[-1] - batch.start_times[0])
 
         return total_speech_time / total_time if total_time > 0 else 0.0
 
-    def _calculate_rhythm_regularity(self, segments: List[ProcessedSegment]) -> float:
+    def _calculate_rhythm_regularity(self, batch: ProcessedSegmentBatch) -> float:
         """Calculate regularity of speech rhythm."""
-        if len(segments) < 3:
+        if len(batch) < 3:
             return 0.0
 
         # Use coefficient of variation of segment durations as rhythm metric
-        durations = [seg.original.duration for seg in segments]
+        durations = batch.durations
         mean_duration = np.mean(durations)
         std_duration = np.std(durations)
 
@@ -768,13 +768,14 @@ class PersonaAnalyzer:
         inclusive_language = self._calculate_inclusive_language_rate(doc)
 
         # Analyze sentiment and emotion
-        sentiment_dist = self._calculate_sentiment_distribution(text)
+        words = [token.lower() for seg in segments for token in seg.tokens]
+        sentiment_dist = self._calculate_sentiment_distribution(text, words)
         emotional_intensity = self._calculate_emotional_intensity(doc)
         enthusiasm_markers = self._find_enthusiasm_markers(text)
 
         # Analyze engagement patterns
         question_to_audience = self._calculate_question_to_audience_rate(segments)
-        cta_frequency = self._calculate_cta_frequency(text)
+        cta_frequency = self._calculate_cta_frequency(text, len(words))
         anecdote_rate = self._calculate_personal_anecdote_rate(segments)
 
         return PersonaFeatures(
@@ -792,20 +793,20 @@ class PersonaAnalyzer:
     def _empty_persona_features(self) -> PersonaFeatures:
         """Return empty persona features."""
         return PersonaFeatures(
-            pov_distribution={},
+            pov_distribution=None,
             direct_address_frequency=0.0,
             inclusive_language_rate=0.0,
-            sentiment_distribution={},
+            sentiment_distribution=None,
             emotional_intensity=0.0,
-            enthusiasm_markers=[],
+            enthusiasm_markers=EnthusiasmMarkers(),
             question_to_audience=0.0,
             call_to_action_frequency=0.0,
             personal_anecdote_rate=0.0
         )
 
-    def _calculate_pov_distribution(self, doc: spacy.tokens.Doc) -> Dict[str, float]:
+    def _calculate_pov_distribution(self, doc: spacy.tokens.Doc) -> POVDistribution:
         """Calculate point of view distribution."""
-        pov_counts = {"I": 0, "you": 0, "we": 0, "they": 0}
+        i_count = you_count = we_count = they_count = 0
         total_pronouns = 0
 
         for token in doc:
@@ -813,18 +814,23 @@ class PersonaAnalyzer:
                 total_pronouns += 1
                 lemma = token.lemma_.lower()
                 if lemma in ["i", "me", "my", "mine", "myself"]:
-                    pov_counts["I"] += 1
+                    i_count += 1
                 elif lemma in ["you", "your", "yours", "yourself"]:
-                    pov_counts["you"] += 1
+                    you_count += 1
                 elif lemma in ["we", "us", "our", "ours", "ourselves"]:
-                    pov_counts["we"] += 1
+                    we_count += 1
                 elif lemma in ["they", "them", "their", "theirs", "themselves"]:
-                    pov_counts["they"] += 1
+                    they_count += 1
 
         if total_pronouns == 0:
-            return pov_counts
+            return POVDistribution()
 
-        return {pov: count / total_pronouns for pov, count in pov_counts.items()}
+        return POVDistribution(
+            I=i_count / total_pronouns,
+            you=you_count / total_pronouns,
+            we=we_count / total_pronouns,
+            they=they_count / total_pronouns
+        )
 
     def _calculate_direct_address_frequency(self, doc: spacy.tokens.Doc) -> float:
         """Calculate frequency of direct address to audience."""
@@ -852,7 +858,8 @@ class PersonaAnalyzer:
 
         return inclusive_count / total_tokens
 
-    def _calculate_sentiment_distribution(self, text: str) -> Dict[str, float]:
+    def _calculate_sentiment_distribution(self, text: str,
+                                          words: Optional[List[str]] = None) -> SentimentDistribution:
         """Calculate sentiment distribution using basic heuristics."""
         # Simple sentiment analysis using word lists
         positive_words = {
@@ -865,20 +872,21 @@ class PersonaAnalyzer:
             'sad', 'angry', 'frustrated', 'annoying', 'wrong', 'problem'
         }
 
-        words = text.lower().split()
+        if words is None:
+            words = text.lower().split()
         positive_count = sum(1 for word in words if word in positive_words)
         negative_count = sum(1 for word in words if word in negative_words)
         neutral_count = len(words) - positive_count - negative_count
 
         total = len(words)
         if total == 0:
-            return {"positive": 0.0, "negative": 0.0, "neutral": 1.0}
+            return SentimentDistribution(neutral=1.0)
 
-        return {
-            "positive": positive_count / total,
-            "negative": negative_count / total,
-            "neutral": neutral_count / total
-        }
+        return SentimentDistribution(
+            positive=positive_count / total,
+            negative=negative_count / total,
+            neutral=neutral_count / total
+        )
 
     def _calculate_emotional_intensity(self, doc: spacy.tokens.Doc) -> float:
         """Calculate emotional intensity based on various markers."""
@@ -896,28 +904,15 @@ class PersonaAnalyzer:
 
         return intensity_count / total_tokens
 
-    def _find_enthusiasm_markers(self, text: str) -> List[str]:
+    def _find_enthusiasm_markers(self, text: str) -> EnthusiasmMarkers:
         """Find markers of enthusiasm in the text."""
-        markers = []
+        text_lower = text.lower()
 
-        # Exclamation points
-        exclamation_count = text.count('!')
-        if exclamation_count > 0:
-            markers.append(f"Exclamation points ({exclamation_count})")
-
-        # Enthusiasm words
-        enthusiasm_words = ['excited', 'thrilled', 'pumped', 'stoked', 'psyched']
-        found_words = [word for word in enthusiasm_words
-                      if word in text.lower()]
-        if found_words:
-            markers.append(f"Enthusiasm words: {', '.join(found_words)}")
-
-        # Capitalization for emphasis
-        caps_matches = re.findall(r'\b[A-Z]{2,}\b', text)
-        if caps_matches:
-            markers.append(f"Caps for emphasis: {len(caps_matches)} instances")
-
-        return markers
+        return EnthusiasmMarkers(
+            exclamations=text.count('!'),
+            enthusiasm_words=[word for word in _ENTHUSIASM_WORDS if word in text_lower],
+            caps_count=sum(1 for _ in _CAPS_RE.finditer(text))
+        )
 
     def _calculate_question_to_audience_rate(self,
                                            segments: List[ProcessedSegment]) -> float:
@@ -934,30 +929,20 @@ class PersonaAnalyzer:
 
         return question_count / total_sentences
 
-    def _calculate_cta_frequency(self, text: str) -> float:
+    def _calculate_cta_frequency(self, text: str, total_words: Optional[int] = None) -> float:
         """Calculate call-to-action frequency."""
-        cta_phrases = [
-            'subscribe', 'like this video', 'hit that like button', 'comment below',
-            'let me know', 'tell me', 'check out', 'go to', 'visit', 'click',
-            'download', 'try this', 'give it a try', 'follow me'
-        ]
-
-        total_words = len(text.split())
+        if total_words is None:
+            total_words = len(text.split())
         if total_words == 0:
             return 0.0
 
-        cta_count = sum(text.lower().count(phrase) for phrase in cta_phrases)
+        text_lower = text.lower()
+        cta_count = sum(text_lower.count(phrase) for phrase in _CTA_PHRASES_ORDERED)
         return cta_count / total_words
 
     def _calculate_personal_anecdote_rate(self,
                                         segments: List[ProcessedSegment]) -> float:
         """Calculate rate of personal anecdotes."""
-        anecdote_indicators = [
-            'i remember', 'when i was', 'i used to', 'my experience',
-            'i found that', 'i discovered', 'i learned', 'personally',
-            'for me', 'in my case'
-        ]
-
         total_segments = len(segments)
         if total_segments == 0:
             return 0.0
@@ -965,7 +950,7 @@ class PersonaAnalyzer:
         anecdote_count = 0
         for segment in segments:
             text = segment.cleaned_text.lower()
-            if any(indicator in text for indicator in anecdote_indicators):
+            if any(indicator in text for indicator in _ANECDOTE_INDICATORS_ORDERED):
                 anecdote_count += 1
 
         return anecdote_count / total_segments
\ No newline at end of file
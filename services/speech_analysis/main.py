@@ -7,6 +7,8 @@ import argparse
 import json
 import sys
 import os
+import functools
+import contextlib
 from typing import List, Optional
 from pathlib import Path
 
@@ -16,13 +18,16 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from speech_types import AnalysisConfig, TranscriptSegment
 from database import create_database_manager, create_transcript_loader
-from preprocess import create_preprocessor
-from speech_profile import create_profile_generator
-from scorer import create_style_scorer
 
+# Commands that need spaCy/NLTK; everything else (e.g. ``list``) only touches the database
+_NLP_COMMANDS = {'analyze', 'score', 'card', 'analyze-file', 'serve'}
 
-def setup_analysis_environment():
+
+def setup_analysis_environment(command: Optional[str] = None):
     """Set up the analysis environment with necessary downloads."""
+    if command is not None and command not in _NLP_COMMANDS:
+        return
+
     try:
         import spacy
         import nltk
@@ -48,9 +53,12 @@ def setup_analysis_environment():
         sys.exit(1)
 
 
-def analyze_creator(creator_id: str, output_file: Optional[str] = None,
-                   config: Optional[AnalysisConfig] = None) -> None:
-    """Analyze a creator's speech patterns and generate style profile."""
+def _run_creator_analysis(creator_id: str, output_file: Optional[str] = None,
+                          config: Optional[AnalysisConfig] = None) -> None:
+    """Analyze a creator and save the style profile, raising if the analysis fails."""
+    from preprocess import create_preprocessor
+    from speech_profile import create_profile_generator
+
     print(f"🔍 Analyzing creator: {creator_id}")
 
     if config is None:
@@ -61,90 +69,139 @@ def analyze_creator(creator_id: str, output_file: Optional[str] = None,
     preprocessor = create_preprocessor(config)
     profile_generator = create_profile_generator(config)
 
-    try:
-        # Ensure database schema is ready
-        db_manager.ensure_ai_config_columns()
+    # Ensure database schema is ready
+    db_manager.ensure_ai_config_columns()
 
-        # Get creator data
-        transcript_data = db_manager.get_creator_transcript_data(creator_id)
-        creator_info = db_manager.get_creator_info(creator_id)
+    # Get creator data
+    transcript_data = db_manager.get_creator_transcript_data(creator_id)
+    creator_info = db_manager.get_creator_info(creator_id)
 
-        print(f"📊 Found {len(transcript_data.segments)} segments from {transcript_data.total_videos} videos")
-        print(f"⏱️  Total duration: {transcript_data.total_duration/60:.1f} minutes")
+    print(f"📊 Found {len(transcript_data.segments)} segments from {transcript_data.total_videos} videos")
+    print(f"⏱️  Total duration: {transcript_data.total_duration/60:.1f} minutes")
 
-        # Check if we have enough data
-        total_words = sum(len(seg.text.split()) for seg in transcript_data.segments)
-        if total_words < config.min_words_for_analysis:
-            print(f"⚠️  Warning: Only {total_words} words found, need at least {config.min_words_for_analysis}")
-            print("Analysis may be less reliable.")
+    # Check if we have enough data
+    total_words = sum(len(seg.text.split()) for seg in transcript_data.segments)
+    if total_words < config.min_words_for_analysis:
+        print(f"⚠️  Warning: Only {total_words} words found, need at least {config.min_words_for_analysis}")
+        print("Analysis may be less reliable.")
 
-        # Preprocess segments
-        print("🔄 Preprocessing transcript segments...")
-        processed_segments = preprocessor.process_transcript_data(transcript_data.segments)
+    # Preprocess segments
+    print("🔄 Preprocessing transcript segments...")
+    processed_segments, segment_batch = preprocessor.process_transcript_batch(transcript_data.segments)
 
-        if not processed_segments:
-            print("❌ No processable segments found after filtering")
-            return
+    if not processed_segments:
+        raise ValueError("No processable segments found after filtering")
 
-        print(f"✅ Processed {len(processed_segments)} segments")
+    print(f"✅ Processed {len(processed_segments)} segments")
 
-        # Generate style profile
-        print("🎯 Generating style profile...")
-        creator_name = creator_info.get('display_name', creator_info.get('username', ''))
-        profile = profile_generator.generate_profile(
-            creator_id, processed_segments, creator_name
-        )
+    # Generate style profile
+    print("🎯 Generating style profile...")
+    creator_name = creator_info.get('display_name', creator_info.get('username', ''))
+    profile = profile_generator.generate_profile(
+        creator_id, processed_segments, creator_name, segment_batch
+    )
 
-        print(f"✅ Generated profile with {profile.confidence_score:.2f} confidence")
-        print(f"📈 Communication archetype: {profile.communication_archetype}")
+    print(f"✅ Generated profile with {profile.confidence_score:.2f} confidence")
+    print(f"📈 Communication archetype: {profile.communication_archetype}")
 
-        # Generate style card
-        print("📝 Creating style card...")
-        style_card = profile_generator.generate_style_card(profile, creator_name)
-        style_card_text = style_card.to_prompt_text()
+    # Generate style card
+    print("📝 Creating style card...")
+    style_card = profile_generator.generate_style_card(profile, creator_name)
+    style_card_text = style_card.to_prompt_text()
 
-        # Save to database
-        print("💾 Saving to database...")
-        db_manager.save_style_profile(profile)
-        db_manager.save_style_card_to_ai_config(creator_id, style_card_text)
+    # Start the file write (if specified) so it overlaps with the database round-trips
+    profile_save = profile_generator.save_profile_async(profile, output_file) if output_file else None
 
-        # Save to file if specified
-        if output_file:
-            profile_generator.save_profile(profile, output_file)
-            print(f"📁 Saved profile to: {output_file}")
+    # Save to database
+    print("💾 Saving to database...")
+    db_manager.save_style_profile(profile)
+    db_manager.save_style_card_to_ai_config(creator_id, style_card_text)
 
-        # Display style card
-        print("\n" + "="*60)
-        print("STYLE CARD")
-        print("="*60)
-        print(style_card_text)
-        print("="*60)
+    if profile_save is not None:
+        profile_save.result()
+        print(f"📁 Saved profile to: {output_file}")
+
+    # Display style card
+    print("\n" + "="*60)
+    print("STYLE CARD")
+    print("="*60)
+    print(style_card_text)
+    print("="*60)
 
-        # Show key statistics
-        print(f"\n📊 Analysis Statistics:")
-        print(f"   • Total words analyzed: {profile.total_words_analyzed:,}")
-        print(f"   • Segments processed: {profile.total_segments_analyzed}")
-        print(f"   • Duration: {profile.total_duration_minutes:.1f} minutes")
-        print(f"   • Confidence score: {profile.confidence_score:.2%}")
-        print(f"   • Lexical diversity: {profile.lexical.type_token_ratio:.2f}")
-        print(f"   • Avg sentence length: {profile.syntax.mean_sentence_length:.1f} words")
-        print(f"   • Speaking rate: {profile.prosody.mean_words_per_minute:.0f} WPM")
+    # Show key statistics
+    print(f"\n📊 Analysis Statistics:")
+    print(f"   • Total words analyzed: {profile.total_words_analyzed:,}")
+    print(f"   • Segments processed: {profile.total_segments_analyzed}")
+    print(f"   • Duration: {profile.total_duration_minutes:.1f} minutes")
+    print(f"   • Confidence score: {profile.confidence_score:.2%}")
+    print(f"   • Lexical diversity: {profile.lexical.type_token_ratio:.2f}")
+    print(f"   • Avg sentence length: {profile.syntax.mean_sentence_length:.1f} words")
+    print(f"   • Speaking rate: {profile.prosody.mean_words_per_minute:.0f} WPM")
 
-        if profile.dominant_patterns:
-            print(f"\n🎨 Dominant Patterns:")
-            for pattern in profile.dominant_patterns[:5]:
-                print(f"   • {pattern}")
+    if profile.dominant_patterns:
+        print(f"\n🎨 Dominant Patterns:")
+        for pattern in profile.dominant_patterns[:5]:
+            print(f"   • {pattern}")
 
-        print(f"\n✅ Analysis complete for {creator_name}")
+    print(f"\n✅ Analysis complete for {creator_name}")
 
+
+def analyze_creator(creator_id: str, output_file: Optional[str] = None,
+                   config: Optional[AnalysisConfig] = None) -> bool:
+    """Analyze a creator's speech patterns and generate style profile. Returns whether it succeeded."""
+    try:
+        _run_creator_analysis(creator_id, output_file, config)
     except Exception as e:
         print(f"❌ Error analyzing creator: {e}")
         import traceback
         traceback.print_exc()
+        return False
+
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_analysis_environment() -> None:
+    """Run the NLP environment checks once per process."""
+    setup_analysis_environment('analyze')
+
+
+def analyze(creator_id: str, output_file: Optional[str] = None,
+            config: Optional[AnalysisConfig] = None) -> bool:
+    """Importable entry point: analyze a creator in the current process. Returns whether it succeeded."""
+    _ensure_analysis_environment()
+    return analyze_creator(creator_id, output_file, config)
+
+
+def serve(config: Optional[AnalysisConfig] = None) -> None:
+    """Persistent worker: analyze newline-delimited creator IDs read from stdin.
+
+    Models stay loaded between requests. Progress output goes to stderr and
+    each request is answered with one JSON line on stdout.
+    """
+    _ensure_analysis_environment()
+    print(json.dumps({'status': 'ready'}), flush=True)
+
+    for line in sys.stdin:
+        creator_id = line.strip()
+        if not creator_id:
+            continue
+
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                _run_creator_analysis(creator_id, config=config)
+            result = {'creator_id': creator_id, 'status': 'done'}
+        except Exception as e:
+            result = {'creator_id': creator_id, 'status': 'error', 'error': str(e)}
+
+        print(json.dumps(result), flush=True)
 
 
 def score_text(text: str, creator_id: str, style_profile_file: Optional[str] = None) -> None:
     """Score how well text matches a creator's style."""
+    from speech_profile import create_profile_generator
+    from scorer import create_style_scorer
+
     print(f"📝 Scoring text similarity to creator: {creator_id}")
 
     config = AnalysisConfig()
@@ -200,6 +257,8 @@ def score_text(text: str, creator_id: str, style_profile_file: Optional[str] = N
 
 def generate_style_card(creator_id: str, output_file: Optional[str] = None) -> None:
     """Generate a style card from existing profile."""
+    from speech_profile import create_profile_generator
+
     print(f"📝 Generating style card for creator: {creator_id}")
 
     try:
@@ -266,6 +325,9 @@ def list_creators() -> None:
 
 def analyze_from_file(input_file: str, output_file: Optional[str] = None) -> None:
     """Analyze speech patterns from a transcript file."""
+    from preprocess import create_preprocessor
+    from speech_profile import create_profile_generator
+
     print(f"📁 Analyzing transcript file: {input_file}")
 
     config = AnalysisConfig()
@@ -291,7 +353,7 @@ def analyze_from_file(input_file: str, output_file: Optional[str] = None) -> Non
 
         # Process segments
         preprocessor = create_preprocessor(config)
-        processed_segments = preprocessor.process_transcript_data(segments)
+        processed_segments, segment_batch = preprocessor.process_transcript_batch(segments)
 
         if not processed_segments:
             print("❌ No processable segments after filtering.")
@@ -299,7 +361,8 @@ def analyze_from_file(input_file: str, output_file: Optional[str] = None) -> Non
 
         # Generate profile
         profile_generator = create_profile_generator(config)
-        profile = profile_generator.generate_profile("file_analysis", processed_segments)
+        profile = profile_generator.generate_profile(
+            "file_analysis", processed_segments, batch=segment_batch)
 
         # Generate style card
         style_card = profile_generator.generate_style_card(profile, "File Analysis")
@@ -332,6 +395,7 @@ Examples:
   python main.py card --creator-id creator123 --output style_card.txt
   python main.py list
   python main.py analyze-file --input transcript.json --output profile.json
+  echo creator123 | python main.py serve
         """
     )
 
@@ -363,20 +427,27 @@ Examples:
     file_parser.add_argument('--input', required=True, help='Input transcript file (JSON/CSV)')
     file_parser.add_argument('--output', help='Output file for style profile')
 
+    # Persistent worker command
+    serve_parser = subparsers.add_parser(
+        'serve', help='Analyze creator IDs read line by line from stdin, keeping models loaded')
+    serve_parser.add_argument('--min-words', type=int, default=500,
+                             help='Minimum words needed for analysis')
+
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return
 
-    # Setup environment
-    setup_analysis_environment()
+    # Setup environment (NLP models are only checked for commands that need them)
+    setup_analysis_environment(args.command)
 
     # Execute command
     try:
         if args.command == 'analyze':
             config = AnalysisConfig(min_words_for_analysis=args.min_words)
-            analyze_creator(args.creator_id, args.output, config)
+            if not analyze_creator(args.creator_id, args.output, config):
+                sys.exit(1)
 
         elif args.command == 'score':
             score_text(args.text, args.creator_id, args.profile)
@@ -390,6 +461,9 @@ Examples:
         elif args.command == 'analyze-file':
             analyze_from_file(args.input, args.output)
 
+        elif args.command == 'serve':
+            serve(AnalysisConfig(min_words_for_analysis=args.min_words))
+
     except KeyboardInterrupt:
         print("\n🛑 Analysis interrupted by user")
     except Exception as e:
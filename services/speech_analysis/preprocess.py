@@ -3,26 +3,174 @@ Preprocessing module for transcript cleaning and timing alignment.
 Handles text normalization, punctuation restoration, and segment preparation.
 """
 
+import os
 import re
+import bisect
+import pickle
 import string
+import hashlib
 import warnings
-from typing import List, Dict, Optional, Tuple
+import functools
+from itertools import accumulate
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
-import spacy
-from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
 
-from speech_types import TranscriptSegment, ProcessedSegment, AnalysisConfig
+if TYPE_CHECKING:
+    import spacy
+    from transformers import Pipeline
+
+from speech_types import TranscriptSegment, ProcessedSegment, ProcessedSegmentBatch, AnalysisConfig
 
 warnings.filterwarnings("ignore")
 
+PUNCTUATION_MODEL_NAME = "oliverguhr/fullstop-punctuation-multilang-large"
+PUNCTUATION_BATCH_SIZE = 16
+SENTENCE_BATCH_SIZE = 64
+
+# Bump whenever preprocessing output or ProcessedSegment layout changes
+PREPROCESS_CACHE_VERSION = 4
+
+# Sentence segmentation only needs the parser; skip the rest of the shared model
+_SENTENCE_DISABLED_PIPES = ("tagger", "attribute_ruler", "lemmatizer")
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_TOKEN_RE = re.compile(r'\S+')
+_ELLIPSIS_RE = re.compile(r'[.]{3,}')
+_EXCLAMATIONS_RE = re.compile(r'[!]{2,}')
+_QUESTIONS_RE = re.compile(r'[?]{2,}')
+
+# Common misheard words in YouTube auto-captions, fixed in a single pass
+_CAPTION_FIXES = {
+    'uh': 'a',
+    'um': '',
+    'yeah': 'yes',
+    'gonna': 'going to',
+    'wanna': 'want to',
+    'kinda': 'kind of',
+    'sorta': 'sort of',
+}
+_CAPTION_FIX_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, _CAPTION_FIXES)) + r')\b',
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_spacy_nlp() -> "spacy.Language":
+    """Load the shared spaCy model once per process.
+
+    Only pipes no stage uses are disabled at load time; callers that need less
+    pass their extra pipes as ``disable=`` when running the model.
+    """
+    import spacy
+
+    try:
+        return spacy.load("en_core_web_sm", disable=["ner", "textcat"])
+    except OSError:
+        raise RuntimeError(
+            "spaCy English model not found. Install with: "
+            "python -m spacy download en_core_web_sm"
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_punctuation_pipeline(model_name: str, quantize: bool = True):
+    """Load the punctuation restoration pipeline once per model name."""
+    # Imported here so transformers/torch are only loaded when punctuation restoration is enabled
+    from transformers import pipeline
+
+    punctuation_pipeline = pipeline(
+        "token-classification",
+        model=model_name,
+        tokenizer=model_name,
+        device=-1,  # CPU only
+        batch_size=PUNCTUATION_BATCH_SIZE
+    )
+
+    if quantize:
+        # Int8 dynamic quantization of the Linear layers for faster CPU inference
+        try:
+            import torch
+
+            punctuation_pipeline.model = torch.ao.quantization.quantize_dynamic(
+                punctuation_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        except Exception as e:
+            print(f"Warning: Could not quantize punctuation model, using full precision: {e}")
+
+    return punctuation_pipeline
+
+
+class ProcessedTranscriptCache:
+    """On-disk cache of processed transcripts, keyed by a hash of the input segments."""
+
+    def __init__(self, cache_dir: str, max_entries: int = 256):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def make_key(self, segments: List[TranscriptSegment], config: AnalysisConfig) -> str:
+        """Hash the segments and the config fields that affect preprocessing output."""
+        digest = hashlib.sha1(repr((
+            PREPROCESS_CACHE_VERSION,
+            config.confidence_threshold,
+            config.min_segment_duration,
+            config.enable_punctuation_restoration,
+            PUNCTUATION_MODEL_NAME,
+            config.quantize_punctuation_model
+        )).encode('utf-8'))
+
+        for seg in segments:
+            digest.update(repr((
+                seg.video_id, seg.start_time, seg.end_time, seg.confidence, seg.text
+            )).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[List[ProcessedSegment]]:
+        """Return cached processed segments, or None on a miss."""
+        try:
+            with open(self._path(key), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Could not read preprocessing cache: {e}")
+            return None
+
+    def set(self, key: str, segments: List[ProcessedSegment]) -> None:
+        """Store processed segments and evict the oldest entries beyond max_entries."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._path(key) + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(segments, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+        except OSError as e:
+            print(f"Warning: Could not write preprocessing cache: {e}")
+
+    def _evict(self) -> None:
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.pkl')]
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            os.remove(entry.path)
+
 
 class TranscriptPreprocessor:
     """Handles cleaning and preprocessing of transcript data."""
 
     def __init__(self, config: AnalysisConfig):
         self.config = config
-        self.nlp = self._load_spacy_model()
+        self.nlp = get_spacy_nlp()
         self.punctuation_model = self._load_punctuation_model()
+        self.cache = ProcessedTranscriptCache(config.cache_dir) if config.cache_dir else None
 
         # Common filler words and discourse markers
         self.filler_words = {
@@ -38,30 +186,18 @@ class TranscriptPreprocessor:
             '[APPLAUSE]', '[applause]', '(applause)', '(Applause)',
             '[laugh]', '[laughs]', '(laugh)', '(laughs)', '[Laugh]'
         }
+        self._artifact_re = re.compile('|'.join(
+            map(re.escape, sorted(self.transcript_artifacts, key=len, reverse=True))
+        ))
 
-    def _load_spacy_model(self) -> spacy.Language:
-        """Load spaCy model for text processing."""
-        try:
-            return spacy.load("en_core_web_sm")
-        except OSError:
-            raise RuntimeError(
-                "spaCy English model not found. Install with: "
-                "python -m spacy download en_core_web_sm"
-            )
-
-    def _load_punctuation_model(self) -> Optional[pipeline]:
+    def _load_punctuation_model(self) -> Optional["Pipeline"]:
         """Load punctuation restoration model."""
         if not self.config.enable_punctuation_restoration:
             return None
 
         try:
-            # Use a lightweight punctuation restoration model
-            model_name = "oliverguhr/fullstop-punctuation-multilang-large"
-            return pipeline(
-                "token-classification",
-                model=model_name,
-                tokenizer=model_name,
-                device=-1  # CPU only
+            return _get_punctuation_pipeline(
+                PUNCTUATION_MODEL_NAME, self.config.quantize_punctuation_model
             )
         except Exception as e:
             print(f"Warning: Could not load punctuation model: {e}")
@@ -70,17 +206,15 @@ class TranscriptPreprocessor:
     def clean_text(self, text: str) -> str:
         """Clean transcript text from artifacts and normalize."""
         # Remove transcript artifacts
-        cleaned = text
-        for artifact in self.transcript_artifacts:
-            cleaned = cleaned.replace(artifact, ' ')
+        cleaned = self._artifact_re.sub(' ', text)
 
         # Normalize whitespace
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned).strip()
 
         # Remove excessive punctuation
-        cleaned = re.sub(r'[.]{3,}', '...', cleaned)
-        cleaned = re.sub(r'[!]{2,}', '!', cleaned)
-        cleaned = re.sub(r'[?]{2,}', '?', cleaned)
+        cleaned = _ELLIPSIS_RE.sub('...', cleaned)
+        cleaned = _EXCLAMATIONS_RE.sub('!', cleaned)
+        cleaned = _QUESTIONS_RE.sub('?', cleaned)
 
         # Handle common YouTube auto-caption errors
         cleaned = self._fix_common_caption_errors(cleaned)
@@ -89,72 +223,73 @@ class TranscriptPreprocessor:
 
     def _fix_common_caption_errors(self, text: str) -> str:
         """Fix common YouTube auto-caption transcription errors."""
-        # Common misheard words
-        fixes = {
-            r'\buh\b': 'a',
-            r'\bum\b': '',
-            r'\byeah\b': 'yes',
-            r'\bgonna\b': 'going to',
-            r'\bwanna\b': 'want to',
-            r'\bkinda\b': 'kind of',
-            r'\bsorta\b': 'sort of',
-        }
-
-        result = text
-        for pattern, replacement in fixes.items():
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-
-        return result
+        return _CAPTION_FIX_RE.sub(lambda m: _CAPTION_FIXES[m.group(0).lower()], text)
 
     def restore_punctuation(self, text: str) -> str:
         """Restore punctuation using ML model if available."""
-        if not self.punctuation_model or len(text.strip()) == 0:
-            return text
+        return self.restore_punctuation_batch([text])[0]
 
-        try:
-            # Split into manageable chunks to avoid token limits
-            chunks = self._split_text_for_processing(text, max_length=512)
-            restored_chunks = []
+    def restore_punctuation_batch(self, texts: List[str]) -> List[str]:
+        """Restore punctuation for many texts, running all their chunks through the model in one call.
 
-            for chunk in chunks:
-                if len(chunk.strip()) < 5:  # Skip very short chunks
-                    restored_chunks.append(chunk)
-                    continue
+        The pipeline and its tokenizer are not safe to call concurrently, so every
+        chunk goes through this single batched call rather than one call per text.
+        """
+        return self._restore_punctuation_batch(texts)[0]
 
-                # Apply punctuation restoration
-                result = self.punctuation_model(chunk)
-                if result:
-                    # Reconstruct text with punctuation
-                    restored = self._reconstruct_punctuated_text(chunk, result)
-                    restored_chunks.append(restored)
-                else:
-                    restored_chunks.append(chunk)
+    def _restore_punctuation_batch(self, texts: List[str]) -> Tuple[List[str], bool]:
+        """restore_punctuation_batch, also reporting whether the model ran (False if missing or failed)."""
+        if not self.punctuation_model:
+            return list(texts), False
 
-            return ' '.join(restored_chunks)
+        try:
+            # Split into manageable chunks to avoid token limits
+            text_chunks = [
+                self._split_text_for_processing(text, max_length=512) if text.strip() else []
+                for text in texts
+            ]
+            restored_chunks = [list(chunks) for chunks in text_chunks]
+
+            # Skip very short chunks, remembering where each batched chunk came from
+            batch_indices = [
+                (t, i)
+                for t, chunks in enumerate(text_chunks)
+                for i, chunk in enumerate(chunks)
+                if len(chunk.strip()) >= 5
+            ]
+
+            if batch_indices:
+                # Apply punctuation restoration in one batched call
+                batch = [text_chunks[t][i] for t, i in batch_indices]
+                results = self.punctuation_model(batch, batch_size=PUNCTUATION_BATCH_SIZE)
+
+                for (t, i), result in zip(batch_indices, results):
+                    if result:
+                        # Reconstruct text with punctuation
+                        restored_chunks[t][i] = self._reconstruct_punctuated_text(text_chunks[t][i], result)
+
+            return [
+                ' '.join(chunks) if text.strip() else text
+                for text, chunks in zip(texts, restored_chunks)
+            ], True
 
         except Exception as e:
             print(f"Warning: Punctuation restoration failed: {e}")
-            return text
+            return list(texts), False
 
     def _split_text_for_processing(self, text: str, max_length: int = 512) -> List[str]:
         """Split text into chunks suitable for model processing."""
-        words = text.split()
+        # Word (start, end) spans and cumulative lengths (+1 per word for the joining space)
+        spans = [match.span() for match in _TOKEN_RE.finditer(text)]
+        offsets = list(accumulate((end - start + 1 for start, end in spans), initial=0))
+
         chunks = []
-        current_chunk = []
-        current_length = 0
-
-        for word in words:
-            word_length = len(word) + 1  # +1 for space
-            if current_length + word_length > max_length and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [word]
-                current_length = word_length
-            else:
-                current_chunk.append(word)
-                current_length += word_length
-
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
+        i = 0
+        while i < len(spans):
+            # Furthest word boundary that keeps the chunk within max_length (at least one word)
+            j = max(bisect.bisect_right(offsets, offsets[i] + max_length) - 1, i + 1)
+            chunks.append(text[spans[i][0]:spans[j - 1][1]])
+            i = j
 
         return chunks
 
@@ -178,16 +313,50 @@ class TranscriptPreprocessor:
 
     def segment_sentences(self, text: str) -> List[str]:
         """Segment text into sentences using spaCy."""
-        doc = self.nlp(text)
+        doc = self.nlp(text, disable=_SENTENCE_DISABLED_PIPES)
         sentences = [sent.text.strip() for sent in doc.sents if sent.text.strip()]
         return sentences
 
+    def segment_sentences_batch(self, texts: List[str]) -> List[List[str]]:
+        """Segment many texts into sentences, streaming them through spaCy in batches."""
+        return [
+            [sent.text.strip() for sent in doc.sents if sent.text.strip()]
+            for doc in self.nlp.pipe(texts, batch_size=SENTENCE_BATCH_SIZE, disable=_SENTENCE_DISABLED_PIPES)
+        ]
+
+    def _prepare_text(self, text: str) -> str:
+        """Clean text and restore punctuation if enabled."""
+        cleaned_text = self.clean_text(text)
+
+        if self.config.enable_punctuation_restoration:
+            cleaned_text = self.restore_punctuation(cleaned_text)
+
+        return cleaned_text
+
+    def _prepare_texts(self, texts: List[str]) -> Tuple[List[str], bool]:
+        """Clean many texts, then restore their punctuation in one batch, preserving order.
+
+        Also returns whether the texts are fully prepared: False if punctuation
+        restoration is enabled but its model was missing or failed.
+        """
+        cleaned_texts = [self.clean_text(text) for text in texts]
+
+        if self.config.enable_punctuation_restoration:
+            return self._restore_punctuation_batch(cleaned_texts)
+
+        return cleaned_texts, True
+
     def calculate_timing_features(self, segment: TranscriptSegment,
                                 next_segment: Optional[TranscriptSegment] = None,
-                                prev_segment: Optional[TranscriptSegment] = None) -> Tuple[float, float, float]:
-        """Calculate timing-based features for a segment."""
+                                prev_segment: Optional[TranscriptSegment] = None,
+                                word_count: Optional[int] = None) -> Tuple[float, float, float]:
+        """Calculate timing-based features for a segment.
+
+        word_count may be passed by callers that have already tokenized segment.text.
+        """
         # Words per minute calculation
-        word_count = len(segment.text.split())
+        if word_count is None:
+            word_count = len(segment.text.split())
         duration_minutes = segment.duration / 60.0
         wpm = word_count / duration_minutes if duration_minutes > 0 else 0
 
@@ -207,87 +376,190 @@ class TranscriptPreprocessor:
 
         return wpm, pause_before, pause_after
 
+    def calculate_timing_arrays(self, segments: List[TranscriptSegment]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate WPM and pauses for an ordered list of segments in one vectorized pass."""
+        count = len(segments)
+        starts = np.fromiter((seg.start_time for seg in segments), dtype=np.float64, count=count)
+        ends = np.fromiter((seg.end_time for seg in segments), dtype=np.float64, count=count)
+        word_counts = np.fromiter((len(seg.text.split()) for seg in segments), dtype=np.float64, count=count)
+
+        # Words per minute calculation
+        duration_minutes = (ends - starts) / 60.0
+        wpm = np.divide(word_counts, duration_minutes,
+                        out=np.zeros(count), where=duration_minutes > 0)
+
+        # Pause calculations: gap to the neighbouring segment, zero if they overlap
+        gaps = np.clip(starts[1:] - ends[:-1], 0.0, None)
+        pause_before = np.concatenate(([0.0], gaps))
+        pause_after = np.concatenate((gaps, [0.0]))
+
+        return wpm, pause_before, pause_after
+
     def process_segment(self, segment: TranscriptSegment,
                        next_segment: Optional[TranscriptSegment] = None,
-                       prev_segment: Optional[TranscriptSegment] = None) -> ProcessedSegment:
-        """Process a single transcript segment."""
-        # Clean and restore punctuation
-        cleaned_text = self.clean_text(segment.text)
+                       prev_segment: Optional[TranscriptSegment] = None,
+                       word_count: Optional[int] = None) -> ProcessedSegment:
+        """Process a single transcript segment.
 
-        if self.config.enable_punctuation_restoration:
-            cleaned_text = self.restore_punctuation(cleaned_text)
+        word_count is the raw segment.text word count, if the caller already has it.
+        """
+        # Clean and restore punctuation
+        cleaned_text = self._prepare_text(segment.text)
 
         # Segment into sentences
         sentences = self.segment_sentences(cleaned_text)
 
         # Calculate timing features
         wpm, pause_before, pause_after = self.calculate_timing_features(
-            segment, next_segment, prev_segment
+            segment, next_segment, prev_segment, word_count
         )
 
-        # Word count
-        word_count = len(cleaned_text.split())
+        return self._build_processed_segment(
+            segment, cleaned_text, sentences, wpm, pause_before, pause_after
+        )
+
+    def process_segments(self, segments: List[TranscriptSegment]) -> List[ProcessedSegment]:
+        """Process independent segments in one batch, without filtering or neighbour context."""
+        cleaned_texts, _ = self._prepare_texts([seg.text for seg in segments])
+        all_sentences = self.segment_sentences_batch(cleaned_texts)
+
+        processed_segments = []
+        for segment, cleaned_text, sentences in zip(segments, cleaned_texts, all_sentences):
+            wpm, pause_before, pause_after = self.calculate_timing_features(segment)
+            processed_segments.append(self._build_processed_segment(
+                segment, cleaned_text, sentences, wpm, pause_before, pause_after
+            ))
+
+        return processed_segments
+
+    def _build_processed_segment(self, segment: TranscriptSegment, cleaned_text: str,
+                                 sentences: List[str], wpm: float,
+                                 pause_before: float, pause_after: float) -> ProcessedSegment:
+        """Assemble a processed segment from already cleaned and segmented text."""
+        # Tokenize once; word count and downstream features reuse the tokens
+        tokens = cleaned_text.split()
 
         return ProcessedSegment(
             original=segment,
             cleaned_text=cleaned_text,
             sentences=sentences,
-            word_count=word_count,
+            word_count=len(tokens),
             words_per_minute=wpm,
             pause_before=pause_before,
-            pause_after=pause_after
+            pause_after=pause_after,
+            tokens=tokens
         )
 
     def process_transcript_data(self, segments: List[TranscriptSegment]) -> List[ProcessedSegment]:
         """Process all segments in a transcript."""
-        if not segments:
-            return []
+        return self.process_transcript_batch(segments)[0]
 
-        # Filter segments by confidence and duration
-        filtered_segments = [
-            seg for seg in segments
-            if (seg.confidence is None or seg.confidence >= self.config.confidence_threshold)
-            and seg.duration >= self.config.min_segment_duration
-        ]
+    def process_transcript_batch(self, segments: List[TranscriptSegment]
+                                 ) -> Tuple[List[ProcessedSegment], ProcessedSegmentBatch]:
+        """Process all segments in a transcript, also returning their numeric columns."""
+        if not segments:
+            return [], ProcessedSegmentBatch.from_segments([])
+
+        # Reuse a previous run over identical segments if one is cached
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(segments, self.config)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached, ProcessedSegmentBatch.from_segments(cached)
+
+        # Filter segments by confidence and duration, noting whether they arrive in order
+        confidence_threshold = self.config.confidence_threshold
+        min_duration = self.config.min_segment_duration
+        filtered_segments = []
+        is_sorted = True
+        last_start = float('-inf')
+
+        for seg in segments:
+            if ((seg.confidence is None or seg.confidence >= confidence_threshold)
+                    and seg.duration >= min_duration):
+                if seg.start_time < last_start:
+                    is_sorted = False
+                last_start = seg.start_time
+                filtered_segments.append(seg)
 
         if not filtered_segments:
-            return []
+            return [], ProcessedSegmentBatch.from_segments([])
 
-        # Sort by start time to ensure proper ordering
-        filtered_segments.sort(key=lambda x: x.start_time)
+        # Sort by start time to ensure proper ordering (YouTube transcripts usually already are)
+        if not is_sorted:
+            filtered_segments.sort(key=lambda x: x.start_time)
 
-        # Process each segment with context
-        processed_segments = []
-        for i, segment in enumerate(filtered_segments):
-            prev_seg = filtered_segments[i-1] if i > 0 else None
-            next_seg = filtered_segments[i+1] if i < len(filtered_segments)-1 else None
+        # Pass 1: clean and restore punctuation for every segment
+        cleaned_texts, fully_prepared = self._prepare_texts([seg.text for seg in filtered_segments])
 
-            processed = self.process_segment(segment, next_seg, prev_seg)
-            if processed.word_count > 0:  # Only include segments with content
-                processed_segments.append(processed)
+        # Pass 2: segment all texts into sentences in one batched spaCy run
+        all_sentences = self.segment_sentences_batch(cleaned_texts)
 
-        return processed_segments
+        # Timing features for all segments at once
+        wpm, pause_before, pause_after = self.calculate_timing_arrays(filtered_segments)
 
-    def extract_transcript_metadata(self, segments: List[ProcessedSegment]) -> Dict[str, float]:
-        """Extract overall metadata from processed segments."""
-        if not segments:
+        # Assemble each segment with its timing context
+        all_processed = [
+            self._build_processed_segment(segment, cleaned_text, sentences, seg_wpm, before, after)
+            for segment, cleaned_text, sentences, seg_wpm, before, after in zip(
+                filtered_segments, cleaned_texts, all_sentences,
+                wpm.tolist(), pause_before.tolist(), pause_after.tolist()
+            )
+        ]
+
+        # Only include segments with content, keeping the timing columns aligned
+        count = len(all_processed)
+        word_counts = np.fromiter((seg.word_count for seg in all_processed), dtype=np.int64, count=count)
+        keep = word_counts > 0
+        processed_segments = [seg for seg, kept in zip(all_processed, keep.tolist()) if kept]
+
+        start_times = np.fromiter((seg.start_time for seg in filtered_segments), dtype=np.float64, count=count)[keep]
+        end_times = np.fromiter((seg.end_time for seg in filtered_segments), dtype=np.float64, count=count)[keep]
+        batch = ProcessedSegmentBatch(
+            word_counts=word_counts[keep],
+            sentence_counts=np.fromiter(
+                (len(seg.sentences) for seg in processed_segments), dtype=np.int64, count=len(processed_segments)),
+            wpm=wpm[keep],
+            pause_before=pause_before[keep],
+            pause_after=pause_after[keep],
+            start_times=start_times,
+            end_times=end_times,
+            durations=end_times - start_times
+        )
+
+        # Don't persist output degraded by a missing or failing punctuation model
+        if cache_key and fully_prepared:
+            self.cache.set(cache_key, processed_segments)
+
+        return processed_segments, batch
+
+    def extract_transcript_metadata(self, segments: Union[List[ProcessedSegment], ProcessedSegmentBatch]
+                                    ) -> Dict[str, float]:
+        """Extract overall metadata from processed segments (or their batch columns)."""
+        if not len(segments):
             return {}
 
-        total_words = sum(seg.word_count for seg in segments)
-        total_duration = sum(seg.original.duration for seg in segments) / 60.0  # minutes
+        batch = segments if isinstance(segments, ProcessedSegmentBatch) \
+            else ProcessedSegmentBatch.from_segments(segments)
+        count = len(batch)
+
+        total_words = int(batch.word_counts.sum())
+        total_duration = float(batch.durations.sum()) / 60.0  # minutes
+        total_sentences = int(batch.sentence_counts.sum())
 
         # Calculate pause statistics
-        pauses = [seg.pause_after for seg in segments if seg.pause_after > 0]
+        pauses = batch.pause_after[batch.pause_after > 0]
 
         metadata = {
-            'total_segments': len(segments),
+            'total_segments': count,
             'total_words': total_words,
             'total_duration_minutes': total_duration,
             'average_wpm': total_words / total_duration if total_duration > 0 else 0,
-            'total_sentences': sum(len(seg.sentences) for seg in segments),
-            'average_words_per_sentence': total_words / sum(len(seg.sentences) for seg in segments) if segments else 0,
-            'pause_frequency': len(pauses) / len(segments) if segments else 0,
-            'average_pause_duration': sum(pauses) / len(pauses) if pauses else 0,
+            'total_sentences': total_sentences,
+            'average_words_per_sentence': total_words / total_sentences if total_sentences else 0,
+            'pause_frequency': len(pauses) / count,
+            'average_pause_duration': float(pauses.mean()) if len(pauses) else 0,
         }
 
         return metadata
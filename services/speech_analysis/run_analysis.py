@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Wrapper script for running speech analysis via the force-speech-analysis.js script.
-This script forwards command line arguments to main.py with the proper subcommand.
+Runs the analysis in-process, falling back to a main.py subprocess if the
+analysis modules can't be imported here.
 """
 
 import sys
@@ -15,13 +16,21 @@ def main():
 
     creator_id = sys.argv[2]
 
+    # Run in-process to avoid cold-starting a second interpreter and reloading models
+    try:
+        from main import analyze
+    except ImportError as e:
+        print(f"Warning: Could not import analysis modules ({e}), running main.py instead")
+    else:
+        sys.exit(0 if analyze(creator_id) else 1)
+
     # Call main.py with the analyze subcommand
     main_script = os.path.join(os.path.dirname(__file__), 'main.py')
     cmd = [sys.executable, main_script, 'analyze', '--creator-id', creator_id]
 
     # Forward environment variables and run the command
     env = os.environ.copy()
-    subprocess.run(cmd, env=env)
+    sys.exit(subprocess.run(cmd, env=env).returncode)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Sample transcript data helpers.
+Lays out canned sample texts as transcript segments for mock data and tests.
+"""
+
+from typing import List
+
+from speech_types import TranscriptSegment
+
+
+def layout_sample_segments(texts: List[str], video_prefix: str,
+                           segments_per_video: int = 3) -> List[TranscriptSegment]:
+    """Lay out sample texts as back-to-back transcript segments.
+
+    Durations are estimated from text length (roughly 2.5 words per second),
+    with a 1-second gap between segments.
+    """
+    segments = []
+    start_time = 0.0
+
+    for i, text in enumerate(texts):
+        duration = len(text.split()) / 2.5
+        end_time = start_time + duration
+
+        segments.append(TranscriptSegment(
+            video_id=f"{video_prefix}_{i // segments_per_video + 1}",  # Group into videos
+            start_time=start_time,
+            end_time=end_time,
+            text=text,
+            confidence=0.95
+        ))
+        start_time = end_time + 1.0  # 1-second gap between segments
+
+    return segments
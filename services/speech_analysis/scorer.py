@@ -3,18 +3,68 @@ Style similarity scoring module.
 Compares new text against creator style profiles to measure similarity.
 """
 
-import math
-from typing import Dict, List, Tuple, Optional
-from collections import Counter
+import re
+import copy
+import functools
+from typing import Dict, List, Tuple, Optional, Union
 import numpy as np
-from scipy.stats import entropy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-from speech_types import StyleProfile, StyleScore, StyleMetric, AnalysisConfig
+try:
+    import ahocorasick
+except ImportError:  # Optional; catchphrase matching falls back to a compiled regex
+    ahocorasick = None
+
+from speech_types import (
+    StyleProfile, StyleScore, StyleMetric, AnalysisConfig, TranscriptSegment,
+    POVDistribution, SentimentDistribution
+)
 from preprocess import TranscriptPreprocessor
 from features import FeatureExtractor
 
+FEATURE_CACHE_SIZE = 1024
+SCORE_CACHE_SIZE = 1024  # Scores kept per profile
+PROFILE_CACHE_SIZE = 16  # Profiles with cached scores
+
+# Weight of each metric in the overall score; unlisted metrics weigh 0.1
+METRIC_WEIGHTS = {
+    StyleMetric.LEXICAL_DIVERSITY: 0.15,
+    StyleMetric.SENTENCE_LENGTH: 0.20,
+    StyleMetric.FILLER_FREQUENCY: 0.15,
+    StyleMetric.POV_DISTRIBUTION: 0.20,
+    StyleMetric.SENTIMENT_PROFILE: 0.15,
+    StyleMetric.CATCHPHRASE_USAGE: 0.15
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _build_catchphrase_automaton(expressions: Tuple[str, ...]):
+    """Build (and cache per phrase set) an Aho-Corasick automaton over lowercased phrases.
+
+    Returns None if every phrase is empty: make_automaton() on an empty trie
+    leaves it unsearchable.
+    """
+    automaton = ahocorasick.Automaton()
+    for expression in expressions:
+        if expression:
+            automaton.add_word(expression, expression)
+    if not len(automaton):
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+@functools.lru_cache(maxsize=32)
+def _build_catchphrase_regex(expressions: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """Build (and cache per phrase set) a lookahead alternation over lowercased phrases.
+
+    Alternatives are ordered longest first and wrapped in a lookahead, so a
+    single finditer pass reports the longest phrase starting at every position.
+    """
+    phrases = sorted({expression for expression in expressions if expression}, key=len, reverse=True)
+    if not phrases:
+        return None
+    return re.compile('(?=(' + '|'.join(map(re.escape, phrases)) + '))')
+
 
 class StyleScorer:
     """Scores text similarity to creator style profiles."""
@@ -22,6 +72,66 @@ class StyleScorer:
     def __init__(self, config: AnalysisConfig):
         self.config = config
         self.preprocessor = TranscriptPreprocessor(config)
+        self.feature_extractor = FeatureExtractor(config)
+
+        # Memoize per-text features, and per-profile scores for repeated texts
+        self._features_for_text = functools.lru_cache(maxsize=FEATURE_CACHE_SIZE)(
+            self._compute_features_for_text)
+        self._score_cache: Dict[Tuple[str, str],
+                                Tuple[StyleProfile, Dict[Tuple[str, bool], StyleScore]]] = {}
+
+    def _create_mock_segment(self, text: str, word_count: Optional[int] = None) -> TranscriptSegment:
+        """Wrap raw text in a transcript segment for processing."""
+        if word_count is None:
+            word_count = len(text.split())
+        return TranscriptSegment(
+            video_id="scorer_temp",
+            start_time=0.0,
+            end_time=word_count / 2.5,  # Rough duration estimate
+            text=text,
+            confidence=1.0
+        )
+
+    def _compute_features_for_text(self, text: str) -> Tuple:
+        """Preprocess a single text and extract its (lexical, syntax, repetition, prosody, persona) features."""
+        # Tokenize once for both the duration estimate and the WPM calculation
+        word_count = len(text.split())
+        processed = self.preprocessor.process_segment(
+            self._create_mock_segment(text, word_count), word_count=word_count)
+        return self.feature_extractor.extract_all_features([processed])
+
+    def _scores_for_profile(self, profile: StyleProfile) -> Dict[Tuple[str, bool], StyleScore]:
+        """Cached (text, detailed) -> score map for a profile, emptied if the profile has changed."""
+        key = (profile.creator_id, profile.generation_timestamp)
+        cached = self._score_cache.get(key)
+        # Profiles can be edited in place, so compare against the snapshot taken at insert time
+        if cached is not None and cached[0] == profile:
+            return cached[1]
+
+        if cached is None and len(self._score_cache) >= PROFILE_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._score_cache[next(iter(self._score_cache))]
+        scores: Dict[Tuple[str, bool], StyleScore] = {}
+        self._score_cache[key] = (copy.deepcopy(profile), scores)
+        return scores
+
+    @staticmethod
+    def _store_score(scores: Dict[Tuple[str, bool], StyleScore], text: str, detailed: bool,
+                     score: StyleScore) -> None:
+        if len(scores) >= SCORE_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del scores[next(iter(scores))]
+        scores[(text, detailed)] = score
+
+    @staticmethod
+    def _copy_score(score: StyleScore) -> StyleScore:
+        """Copy of a cached score with its own dicts and list, so callers can't alter the cache."""
+        return StyleScore(
+            overall_score=score.overall_score,
+            metric_scores=dict(score.metric_scores),
+            detailed_breakdown=dict(score.detailed_breakdown),
+            recommendations=list(score.recommendations)
+        )
 
     def score_text_similarity(self, text: str, profile: StyleProfile,
                             detailed: bool = True) -> StyleScore:
@@ -29,23 +139,17 @@ class StyleScorer:
         if not text.strip():
             return self._create_empty_score()
 
-        # Create a mock segment for processing
-        from speech_types import TranscriptSegment, ProcessedSegment
-        mock_segment = TranscriptSegment(
-            video_id="scorer_temp",
-            start_time=0.0,
-            end_time=len(text.split()) / 2.5,  # Rough duration estimate
-            text=text,
-            confidence=1.0
-        )
-
-        processed = self.preprocessor.process_segment(mock_segment)
-        segments = [processed]
+        scores = self._scores_for_profile(profile)
+        score = scores.get((text, detailed))
+        if score is None:
+            score = self._score_features(text, self._features_for_text(text), profile, detailed)
+            self._store_score(scores, text, detailed, score)
+        return self._copy_score(score)
 
-        # Extract features from the text
-        feature_extractor = FeatureExtractor(self.config)
-        text_lexical, text_syntax, text_repetition, text_prosody, text_persona = \
-            feature_extractor.extract_all_features(segments)
+    def _score_features(self, text: str, features: Tuple, profile: StyleProfile,
+                        detailed: bool) -> StyleScore:
+        """Score already extracted text features against a profile."""
+        text_lexical, text_syntax, text_repetition, text_prosody, text_persona = features
 
         # Score each feature category
         metric_scores = {}
@@ -136,54 +240,46 @@ class StyleScorer:
         if not profile_lexical.filler_words:
             return 0.8  # Neutral score if profile has no filler data
 
-        scores = []
-        for filler, profile_freq in profile_lexical.filler_words.items():
-            text_freq = text_lexical.filler_words.get(filler, 0.0)
-            freq_diff = abs(text_freq - profile_freq)
-            # Normalize by reasonable filler frequency range (0-0.2)
-            normalized_diff = freq_diff / 0.2
-            filler_score = max(0.0, 1.0 - normalized_diff)
-            scores.append(filler_score)
-
-        return sum(scores) / len(scores) if scores else 0.5
+        # Normalize by reasonable filler frequency range (0-0.2)
+        return self._frequency_similarity(
+            text_lexical.filler_words, profile_lexical.filler_words,
+            tuple(profile_lexical.filler_words), scale=0.2)
 
     def _score_pov_distribution(self, text_persona, profile_persona) -> float:
         """Score point-of-view distribution similarity."""
-        if not profile_persona.pov_distribution:
-            return 0.5
-
-        pov_categories = ["I", "you", "we", "they"]
-        scores = []
+        if profile_persona.pov_distribution is None:
+            return 0.5  # Neutral score if the profile has no POV data
 
-        for pov in pov_categories:
-            profile_freq = profile_persona.pov_distribution.get(pov, 0.0)
-            text_freq = text_persona.pov_distribution.get(pov, 0.0)
-            freq_diff = abs(text_freq - profile_freq)
-            # Normalize by reasonable POV frequency range (0-0.5)
-            normalized_diff = freq_diff / 0.5
-            pov_score = max(0.0, 1.0 - normalized_diff)
-            scores.append(pov_score)
-
-        return sum(scores) / len(scores)
+        # Normalize by reasonable POV frequency range (0-0.5)
+        return self._vector_similarity(
+            np.array((text_persona.pov_distribution or POVDistribution()).values()),
+            np.array(profile_persona.pov_distribution.values()), scale=0.5)
 
     def _score_sentiment_profile(self, text_persona, profile_persona) -> float:
         """Score sentiment distribution similarity."""
-        if not profile_persona.sentiment_distribution:
+        if profile_persona.sentiment_distribution is None:
+            return 0.5  # Neutral score if the profile has no sentiment data
+
+        # Normalize by sentiment range (0-1.0)
+        return self._vector_similarity(
+            np.array((text_persona.sentiment_distribution or SentimentDistribution()).values()),
+            np.array(profile_persona.sentiment_distribution.values()), scale=1.0)
+
+    @staticmethod
+    def _frequency_similarity(text_dist: Dict[str, float], profile_dist: Dict[str, float],
+                              keys: Tuple[str, ...], scale: float) -> float:
+        """Mean per-key closeness of two frequency dicts, clipped at zero."""
+        if not keys:
             return 0.5
 
-        sentiment_categories = ["positive", "negative", "neutral"]
-        scores = []
-
-        for sentiment in sentiment_categories:
-            profile_freq = profile_persona.sentiment_distribution.get(sentiment, 0.0)
-            text_freq = text_persona.sentiment_distribution.get(sentiment, 0.0)
-            freq_diff = abs(text_freq - profile_freq)
-            # Normalize by sentiment range (0-1.0)
-            normalized_diff = freq_diff / 1.0
-            sentiment_score = max(0.0, 1.0 - normalized_diff)
-            scores.append(sentiment_score)
+        text_vec = np.fromiter((text_dist.get(key, 0.0) for key in keys), dtype=float, count=len(keys))
+        profile_vec = np.fromiter((profile_dist.get(key, 0.0) for key in keys), dtype=float, count=len(keys))
+        return StyleScorer._vector_similarity(text_vec, profile_vec, scale)
 
-        return sum(scores) / len(scores)
+    @staticmethod
+    def _vector_similarity(text_vec: np.ndarray, profile_vec: np.ndarray, scale: float) -> float:
+        """Mean per-component closeness of two aligned frequency vectors, clipped at zero."""
+        return float(np.maximum(0.0, 1.0 - np.abs(text_vec - profile_vec) / scale).mean())
 
     def _score_catchphrase_usage(self, text: str, signature_expressions: List[str]) -> float:
         """Score usage of creator's signature phrases."""
@@ -191,12 +287,22 @@ class StyleScorer:
             return 0.7  # Neutral score if no signature phrases
 
         text_lower = text.lower()
-        matches = 0
-        total_expressions = len(signature_expressions)
-
-        for expression in signature_expressions:
-            if expression.lower() in text_lower:
-                matches += 1
+        expressions = tuple(expression.lower() for expression in signature_expressions)
+        total_expressions = len(expressions)
+
+        if ahocorasick is not None:
+            # Single pass over the text finds every phrase at once
+            automaton = _build_catchphrase_automaton(expressions)
+            found = {expression for _, expression in automaton.iter(text_lower)} if automaton else set()
+            matches = sum(1 for expression in expressions if not expression or expression in found)
+        else:
+            # Single regex pass; a phrase is present if it occurs within any longest match
+            phrase_re = _build_catchphrase_regex(expressions)
+            found = {match.group(1) for match in phrase_re.finditer(text_lower)} if phrase_re else set()
+            matches = sum(
+                1 for expression in expressions
+                if not expression or any(expression in phrase for phrase in found)
+            )
 
         # Score based on presence of signature expressions
         if total_expressions == 0:
@@ -209,21 +315,11 @@ class StyleScorer:
 
     def _calculate_overall_score(self, metric_scores: Dict[StyleMetric, float]) -> float:
         """Calculate weighted overall similarity score."""
-        # Define weights for different metrics
-        weights = {
-            StyleMetric.LEXICAL_DIVERSITY: 0.15,
-            StyleMetric.SENTENCE_LENGTH: 0.20,
-            StyleMetric.FILLER_FREQUENCY: 0.15,
-            StyleMetric.POV_DISTRIBUTION: 0.20,
-            StyleMetric.SENTIMENT_PROFILE: 0.15,
-            StyleMetric.CATCHPHRASE_USAGE: 0.15
-        }
-
         weighted_sum = 0.0
         total_weight = 0.0
 
         for metric, score in metric_scores.items():
-            weight = weights.get(metric, 0.1)
+            weight = METRIC_WEIGHTS.get(metric, 0.1)
             weighted_sum += score * weight
             total_weight += weight
 
@@ -258,17 +354,21 @@ class StyleScorer:
             )
 
         # POV breakdown
+        text_pov = text_persona.pov_distribution or POVDistribution()
+        profile_pov = profile.persona.pov_distribution or POVDistribution()
         for pov in ["I", "you", "we"]:
-            text_freq = text_persona.pov_distribution.get(pov, 0.0)
-            profile_freq = profile.persona.pov_distribution.get(pov, 0.0)
+            text_freq = getattr(text_pov, pov)
+            profile_freq = getattr(profile_pov, pov)
             breakdown[f"pov_{pov.lower()}"] = (
                 f"Text: {text_freq:.1%}, Profile: {profile_freq:.1%}"
             )
 
         # Sentiment breakdown
+        text_sentiment = text_persona.sentiment_distribution or SentimentDistribution()
+        profile_sentiment = profile.persona.sentiment_distribution or SentimentDistribution()
         for sentiment in ["positive", "negative", "neutral"]:
-            text_freq = text_persona.sentiment_distribution.get(sentiment, 0.0)
-            profile_freq = profile.persona.sentiment_distribution.get(sentiment, 0.0)
+            text_freq = getattr(text_sentiment, sentiment)
+            profile_freq = getattr(profile_sentiment, sentiment)
             breakdown[f"sentiment_{sentiment}"] = (
                 f"Text: {text_freq:.1%}, Profile: {profile_freq:.1%}"
             )
@@ -297,11 +397,12 @@ class StyleScorer:
 
         # Low POV score
         if metric_scores.get(StyleMetric.POV_DISTRIBUTION, 1.0) < 0.6:
-            if profile.persona.pov_distribution.get("you", 0) > 0.1:
+            pov = profile.persona.pov_distribution or POVDistribution()
+            if pov.you > 0.1:
                 recommendations.append("Address the audience more directly using 'you'")
-            elif profile.persona.pov_distribution.get("we", 0) > 0.08:
+            elif pov.we > 0.08:
                 recommendations.append("Use more inclusive language with 'we' and 'us'")
-            elif profile.persona.pov_distribution.get("I", 0) > 0.15:
+            elif pov.I > 0.15:
                 recommendations.append("Share more personal experiences and insights")
 
         # Low catchphrase score
@@ -312,9 +413,10 @@ class StyleScorer:
 
         # Low sentiment score
         if metric_scores.get(StyleMetric.SENTIMENT_PROFILE, 1.0) < 0.6:
-            if profile.persona.sentiment_distribution.get("positive", 0) > 0.6:
+            sentiment = profile.persona.sentiment_distribution or SentimentDistribution()
+            if sentiment.positive > 0.6:
                 recommendations.append("Adopt a more positive, upbeat tone")
-            elif profile.persona.sentiment_distribution.get("negative", 0) > 0.3:
+            elif sentiment.negative > 0.3:
                 recommendations.append("Include more critical analysis and honest feedback")
 
         # Overall low score
@@ -328,7 +430,28 @@ class StyleScorer:
 
     def batch_score_texts(self, texts: List[str], profile: StyleProfile) -> List[StyleScore]:
         """Score multiple texts against a profile."""
-        return [self.score_text_similarity(text, profile, detailed=False) for text in texts]
+        # Preprocess each distinct uncached text once, in one batch so spaCy/HF can batch across them
+        scores = self._scores_for_profile(profile)
+        pending_texts = [
+            text for text in dict.fromkeys(texts)
+            if text.strip() and (text, False) not in scores
+        ]
+        processed_segments = self.preprocessor.process_segments(
+            [self._create_mock_segment(text) for text in pending_texts]
+        )
+
+        results = {}
+        for text, processed in zip(pending_texts, processed_segments):
+            features = self.feature_extractor.extract_all_features([processed])
+            results[text] = self._score_features(text, features, profile, detailed=False)
+            self._store_score(scores, text, False, results[text])
+
+        return [
+            self._copy_score(results.get(text) or scores.get((text, False)) or self._score_features(
+                text, self._features_for_text(text), profile, detailed=False))
+            if text.strip() else self._create_empty_score()
+            for text in texts
+        ]
 
     def compare_profiles(self, profile1: StyleProfile, profile2: StyleProfile) -> float:
         """Compare similarity between two style profiles."""
@@ -362,28 +485,22 @@ class StyleScorer:
 
         return sum(scores) / len(scores) if scores else 0.0
 
-    def _calculate_distribution_similarity(self, dist1: Dict[str, float],
-                                         dist2: Dict[str, float]) -> float:
+    def _calculate_distribution_similarity(self, dist1: Optional[Union[POVDistribution, SentimentDistribution]],
+                                         dist2: Optional[Union[POVDistribution, SentimentDistribution]]) -> float:
         """Calculate similarity between two probability distributions."""
-        if not dist1 or not dist2:
+        if dist1 is None or dist2 is None:
             return 0.5
 
-        # Get all keys from both distributions
-        all_keys = set(dist1.keys()) | set(dist2.keys())
+        # Both distributions share the same fixed category order
+        vec1 = np.array(dist1.values())
+        vec2 = np.array(dist2.values())
 
-        # Create aligned vectors
-        vec1 = [dist1.get(key, 0.0) for key in all_keys]
-        vec2 = [dist2.get(key, 0.0) for key in all_keys]
+        denom = np.linalg.norm(vec1) * np.linalg.norm(vec2)
+        if denom == 0:
+            return 0.0
 
         # Calculate cosine similarity
-        try:
-            vec1 = np.array(vec1).reshape(1, -1)
-            vec2 = np.array(vec2).reshape(1, -1)
-            similarity = cosine_similarity(vec1, vec2)[0][0]
-            return max(0.0, similarity)  # Ensure non-negative
-        except:
-            return 0.5
-
+        return max(0.0, float(np.dot(vec1, vec2) / denom))  # Ensure non-negative
 
 def create_style_scorer(config: Optional[AnalysisConfig] = None) -> StyleScorer:
     """Factory function to create a style scorer."""
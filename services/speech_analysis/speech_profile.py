@@ -3,19 +3,169 @@ Style profile aggregation and generation module.
 Creates comprehensive style profiles and human-readable style cards.
 """
 
+import os
+import copy
 import json
+import mmap
+import heapq
 import datetime
-from typing import List, Dict, Any, Optional
-from dataclasses import asdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
+from dataclasses import dataclass, fields, is_dataclass, replace
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # Optional; profile save/load fall back to the stdlib json module
+    orjson = None
 
 from speech_types import (
-    ProcessedSegment, StyleProfile, StyleCard, LexicalFeatures,
+    ProcessedSegment, ProcessedSegmentBatch, StyleProfile, StyleCard, LexicalFeatures,
     SyntaxFeatures, RepetitionFeatures, ProsodyFeatures, PersonaFeatures,
-    AnalysisConfig
+    AnalysisConfig, POVDistribution, SentimentDistribution
 )
 from features import FeatureExtractor
 from preprocess import TranscriptPreprocessor
 
+STYLE_CARD_CACHE_SIZE = 256
+PROFILE_MMAP_THRESHOLD = 1 << 20  # Map profile files at least this large instead of reading them
+
+# Output caps for the pattern extractors; each stops checking once its list is full
+MAX_DOMINANT_PATTERNS = 8
+MAX_SIGNATURE_ELEMENTS = 6
+MAX_CARD_PATTERNS = 6
+MAX_TONE_ELEMENTS = 4
+MAX_FORMATTING_PREFERENCES = 4
+MAX_AVOID_PATTERNS = 3
+
+# Pre-parsed templates for the pattern and signature strings (bound str.format methods)
+_TPL_FILLER = "Frequent use of '{0}' ({1:.1%})".format
+_TPL_SIGNATURE_PHRASE = "Signature phrase: '{0}'".format
+_TPL_CHARACTERISTIC_PHRASE = "Characteristic phrase: '{0}'".format
+_TPL_DISCOURSE_MARKER = "Frequent discourse marker: '{0}'".format
+_TPL_RECURRING_EXPRESSION = "Recurring expression: '{0}'".format
+_TPL_ENTHUSIASM = "Enthusiasm: {0}".format
+_TPL_CARD_FILLER = "Uses '{0}' frequently ({1:.1%} of speech)".format
+_TPL_SHORT_SENTENCES = "Prefers short, punchy sentences (avg {0:.0f} words)".format
+_TPL_LONG_SENTENCES = "Uses detailed, complex sentences (avg {0:.0f} words)".format
+_TPL_QUESTIONS = "Frequently asks questions ({0:.1%} of sentences)".format
+_TPL_FAST_PACE = "Fast-paced delivery ({0:.0f} WPM)".format
+_TPL_SLOW_PACE = "Thoughtful pacing ({0:.0f} WPM)".format
+
+
+class AnalyzedFeatures(NamedTuple):
+    """Feature values shared by the pattern, archetype and style-card extractors, read once."""
+    top_filler: Tuple[Optional[str], float]
+    top_marker: Tuple[Optional[str], float]
+    you_pov: float
+    we_pov: float
+    i_pov: float
+    positive_sentiment: float
+    negative_sentiment: float
+    enthusiasm_categories: int
+    question_frequency: float
+    imperative_frequency: float
+    mean_sentence_length: float
+    word_repetition_rate: float
+    direct_address_frequency: float
+    signature_expressions: List[str]
+
+
+@dataclass(frozen=True, slots=True)
+class PatternThresholds:
+    """Cut-offs used when turning profile features into patterns, archetypes and card text."""
+    # Lexical
+    dominant_filler_rate: float = 0.05
+    card_filler_rate: float = 0.03
+    frequent_discourse_marker_rate: float = 0.02
+    high_lexical_diversity: float = 0.7
+    low_lexical_diversity: float = 0.3
+    rare_hesitation_rate: float = 0.01
+    entertainer_like_rate: float = 0.05
+
+    # Sentence length (words) and length distribution shares
+    short_sentence_length: float = 10
+    summary_short_sentence_length: float = 12
+    storyteller_sentence_length: float = 15
+    card_long_sentence_length: float = 18
+    long_sentence_length: float = 20
+    concise_short_share: float = 0.5
+    detailed_long_share: float = 0.3
+
+    # Questions, imperatives and lists
+    frequent_question_rate: float = 0.15
+    question_rate: float = 0.1
+    rare_question_rate: float = 0.05
+    imperative_rate: float = 0.1
+    authoritative_imperative_rate: float = 0.08
+    rare_imperative_rate: float = 0.03
+    list_usage_rate: float = 0.2
+
+    # Repetition
+    emphatic_repetition_rate: float = 0.3
+    repetition_emphasis_rate: float = 0.2
+
+    # Point of view and direct address
+    direct_you_rate: float = 0.1
+    educator_you_rate: float = 0.15
+    inclusive_we_rate: float = 0.08
+    motivator_we_rate: float = 0.1
+    storyteller_i_rate: float = 0.2
+    direct_address_rate: float = 0.1
+
+    # Sentiment and enthusiasm
+    predominantly_positive_rate: float = 0.7
+    upbeat_positive_rate: float = 0.6
+    critical_negative_rate: float = 0.3
+    rare_negative_rate: float = 0.1
+    enthusiastic_marker_categories: int = 2
+
+    # Engagement
+    call_to_action_rate: float = 0.01
+    storyteller_anecdote_rate: float = 0.3
+    rare_anecdote_rate: float = 0.1
+
+    # Speaking pace (words per minute)
+    fast_wpm: float = 160
+    slow_wpm: float = 120
+
+
+DEFAULT_PATTERN_THRESHOLDS = PatternThresholds()
+
+ARCHETYPES = ("educator", "entertainer", "motivator", "storyteller")
+
+# Points each archetype earns per indicator in _determine_communication_archetype (one row per archetype)
+ARCHETYPE_WEIGHTS = np.array([
+    # edu      |   entertainer   |   motivator   |  storyteller
+    [2, 2, 1,    0, 0, 0,          0, 0, 0,        0, 0, 0],  # educator
+    [0, 0, 0,    2, 2, 1,          0, 0, 0,        0, 0, 0],  # entertainer
+    [0, 0, 0,    0, 0, 0,          2, 2, 1,        0, 0, 0],  # motivator
+    [0, 0, 0,    0, 0, 0,          0, 0, 0,        1, 2, 1],  # storyteller
+], dtype=np.int8)
+
+
+def _confidence_kernel(total_words: int, min_words: int, type_token_ratio: float,
+                       mean_sentence_length: float, sentence_length_variance: float,
+                       pov_total: float) -> float:
+    """Average of the volume, diversity, syntax-consistency and persona confidence factors."""
+    # Content volume factor
+    volume_factor = min(1.0, total_words / (min_words * 2))
+
+    # Lexical diversity factor (higher diversity = more reliable)
+    diversity_factor = min(1.0, type_token_ratio * 2)
+
+    # Persona consistency factor
+    persona_factor = min(1.0, pov_total) if pov_total > 0 else 0.5
+
+    # Syntax consistency factor (only defined when sentence lengths are known)
+    if mean_sentence_length > 0:
+        syntax_factor = min(1.0, 1.0 / (1.0 + sentence_length_variance / mean_sentence_length))
+        return (volume_factor + diversity_factor + syntax_factor + persona_factor) / 4
+
+    return (volume_factor + diversity_factor + persona_factor) / 3
+
 
 class StyleProfileGenerator:
     """Generates comprehensive style profiles from processed segments."""
@@ -24,15 +174,27 @@ class StyleProfileGenerator:
         self.config = config
         self.preprocessor = TranscriptPreprocessor(config)
         self.feature_extractor = FeatureExtractor(config)
+        self._thresholds = DEFAULT_PATTERN_THRESHOLDS
+
+        # Style cards keyed on (creator_id, generation_timestamp, creator_name)
+        self._style_card_cache: Dict[Tuple[str, str, Optional[str]], Tuple[StyleProfile, StyleCard]] = {}
+
+        # Background writer for save_profile_async, created on first use
+        self._io_executor: Optional[ThreadPoolExecutor] = None
 
     def generate_profile(self, creator_id: str, segments: List[ProcessedSegment],
-                        creator_name: Optional[str] = None) -> StyleProfile:
-        """Generate a complete style profile from processed segments."""
+                        creator_name: Optional[str] = None,
+                        batch: Optional[ProcessedSegmentBatch] = None) -> StyleProfile:
+        """Generate a complete style profile from processed segments (and their batch columns, if already built)."""
         if not segments:
             raise ValueError("No segments provided for profile generation")
 
+        # Per-segment columns for the aggregate sums and prosody statistics
+        if batch is None:
+            batch = ProcessedSegmentBatch.from_segments(segments)
+
         # Validate minimum content requirements
-        total_words = sum(seg.word_count for seg in segments)
+        total_words = int(batch.word_counts.sum())
         if total_words < self.config.min_words_for_analysis:
             raise ValueError(
                 f"Insufficient content for reliable analysis. "
@@ -40,21 +202,22 @@ class StyleProfileGenerator:
             )
 
         # Extract all feature types
-        lexical, syntax, repetition, prosody, persona = self.feature_extractor.extract_all_features(segments)
+        lexical, syntax, repetition, prosody, persona = self.feature_extractor.extract_all_features(segments, batch)
 
         # Calculate metadata
-        total_duration = sum(seg.original.duration for seg in segments) / 60.0  # minutes
-        confidence_score = self._calculate_confidence_score(segments, lexical, syntax, persona)
+        total_duration = float(batch.durations.sum()) / 60.0  # minutes
+        confidence_score = self._calculate_confidence_score(segments, total_words, lexical, syntax, persona)
 
         # Identify dominant patterns and archetype
-        dominant_patterns = self._identify_dominant_patterns(lexical, syntax, repetition, persona)
-        signature_elements = self._extract_signature_elements(lexical, repetition, persona)
-        archetype = self._determine_communication_archetype(syntax, persona, lexical)
+        analyzed = self._analyze_features(lexical, syntax, repetition, persona)
+        dominant_patterns = self._identify_dominant_patterns(analyzed, lexical)
+        signature_elements = self._extract_signature_elements(analyzed, lexical, persona)
+        archetype = self._determine_communication_archetype(analyzed, syntax, persona, lexical)
 
         return StyleProfile(
             creator_id=creator_id,
             profile_version="1.0",
-            generation_timestamp=datetime.datetime.utcnow().isoformat(),
+            generation_timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
             lexical=lexical,
             syntax=syntax,
             repetition=repetition,
@@ -69,179 +232,221 @@ class StyleProfileGenerator:
             confidence_score=confidence_score
         )
 
-    def _calculate_confidence_score(self, segments: List[ProcessedSegment],
+    def _calculate_confidence_score(self, segments: List[ProcessedSegment], total_words: int,
                                   lexical: LexicalFeatures, syntax: SyntaxFeatures,
                                   persona: PersonaFeatures) -> float:
         """Calculate confidence score for the analysis."""
-        factors = []
-
-        # Content volume factor
-        total_words = sum(seg.word_count for seg in segments)
-        volume_factor = min(1.0, total_words / (self.config.min_words_for_analysis * 2))
-        factors.append(volume_factor)
-
-        # Lexical diversity factor (higher diversity = more reliable)
-        diversity_factor = min(1.0, lexical.type_token_ratio * 2)
-        factors.append(diversity_factor)
-
-        # Syntax consistency factor
-        if syntax.mean_sentence_length > 0:
-            syntax_factor = min(1.0, 1.0 / (1.0 + syntax.sentence_length_variance / syntax.mean_sentence_length))
-            factors.append(syntax_factor)
+        return _confidence_kernel(
+            total_words,
+            self.config.min_words_for_analysis,
+            lexical.type_token_ratio,
+            syntax.mean_sentence_length,
+            syntax.sentence_length_variance,
+            sum(persona.pov_distribution.values()) if persona.pov_distribution else 0.0
+        )
 
-        # Persona consistency factor
-        pov_total = sum(persona.pov_distribution.values())
-        persona_factor = min(1.0, pov_total) if pov_total > 0 else 0.5
-        factors.append(persona_factor)
+    @staticmethod
+    def _argmax_dict(d: Dict[str, float]) -> Tuple[Optional[str], float]:
+        """Return the (key, value) pair with the largest value; ties keep the first key."""
+        best_k, best_v = None, float('-inf')
+        for k, v in d.items():
+            if v > best_v:
+                best_k, best_v = k, v
+        return best_k, best_v
+
+    def _analyze_features(self, lexical: LexicalFeatures, syntax: SyntaxFeatures,
+                          repetition: RepetitionFeatures, persona: PersonaFeatures) -> AnalyzedFeatures:
+        """Read the feature values used by several extractors in a single pass."""
+        pov = persona.pov_distribution or POVDistribution()
+        sentiment = persona.sentiment_distribution or SentimentDistribution()
+
+        return AnalyzedFeatures(
+            top_filler=self._argmax_dict(lexical.filler_words),
+            top_marker=self._argmax_dict(lexical.discourse_markers),
+            you_pov=pov.you,
+            we_pov=pov.we,
+            i_pov=pov.I,
+            positive_sentiment=sentiment.positive,
+            negative_sentiment=sentiment.negative,
+            enthusiasm_categories=persona.enthusiasm_markers.category_count,
+            question_frequency=syntax.question_frequency,
+            imperative_frequency=syntax.imperative_frequency,
+            mean_sentence_length=syntax.mean_sentence_length,
+            word_repetition_rate=repetition.word_repetition_rate,
+            direct_address_frequency=persona.direct_address_frequency,
+            signature_expressions=repetition.signature_expressions
+        )
 
-        return sum(factors) / len(factors) if factors else 0.5
+    def _analyze_profile(self, profile: StyleProfile) -> AnalyzedFeatures:
+        """Shared feature values for a generated profile."""
+        return self._analyze_features(profile.lexical, profile.syntax,
+                                      profile.repetition, profile.persona)
 
-    def _identify_dominant_patterns(self, lexical: LexicalFeatures, syntax: SyntaxFeatures,
-                                  repetition: RepetitionFeatures, persona: PersonaFeatures) -> List[str]:
+    def _identify_dominant_patterns(self, analyzed: AnalyzedFeatures,
+                                  lexical: LexicalFeatures) -> List[str]:
         """Identify the most prominent patterns in the creator's style."""
+        T = self._thresholds
         patterns = []
 
-        # Lexical patterns
-        if lexical.filler_words:
-            top_filler = max(lexical.filler_words.items(), key=lambda x: x[1])
-            if top_filler[1] > 0.05:  # More than 5% filler usage
-                patterns.append(f"Frequent use of '{top_filler[0]}' ({top_filler[1]:.1%})")
+        # Lexical patterns (an empty filler dict yields -inf and never passes)
+        top_filler = analyzed.top_filler
+        if top_filler[1] > T.dominant_filler_rate:
+            patterns.append(_TPL_FILLER(top_filler[0], top_filler[1]))
 
-        if lexical.type_token_ratio > 0.7:
+        if lexical.type_token_ratio > T.high_lexical_diversity:
             patterns.append("High lexical diversity")
-        elif lexical.type_token_ratio < 0.3:
+        elif lexical.type_token_ratio < T.low_lexical_diversity:
             patterns.append("Repetitive vocabulary")
 
         # Syntax patterns
-        if syntax.mean_sentence_length < 10:
+        if analyzed.mean_sentence_length < T.short_sentence_length:
             patterns.append("Short, punchy sentences")
-        elif syntax.mean_sentence_length > 20:
+        elif analyzed.mean_sentence_length > T.long_sentence_length:
             patterns.append("Long, complex sentences")
 
-        if syntax.question_frequency > 0.15:
+        if analyzed.question_frequency > T.frequent_question_rate:
             patterns.append("Frequent use of questions")
 
-        if syntax.imperative_frequency > 0.1:
+        if analyzed.imperative_frequency > T.imperative_rate:
             patterns.append("Direct, imperative style")
 
         # Repetition patterns
-        if repetition.word_repetition_rate > 0.3:
+        if analyzed.word_repetition_rate > T.emphatic_repetition_rate:
             patterns.append("Emphatic repetition")
 
-        if repetition.signature_expressions:
-            top_expression = repetition.signature_expressions[0]
-            patterns.append(f"Signature phrase: '{top_expression}'")
+        if analyzed.signature_expressions:
+            top_expression = analyzed.signature_expressions[0]
+            patterns.append(_TPL_SIGNATURE_PHRASE(top_expression))
 
         # Persona patterns
-        if persona.pov_distribution.get("you", 0) > 0.1:
+        if analyzed.you_pov > T.direct_you_rate:
             patterns.append("Direct audience engagement")
 
-        if persona.sentiment_distribution.get("positive", 0) > 0.7:
+        if len(patterns) >= MAX_DOMINANT_PATTERNS:
+            return patterns
+
+        if analyzed.positive_sentiment > T.predominantly_positive_rate:
             patterns.append("Predominantly positive tone")
 
-        return patterns[:8]  # Return top 8 patterns
+        return patterns
 
-    def _extract_signature_elements(self, lexical: LexicalFeatures,
-                                  repetition: RepetitionFeatures,
+    def _extract_signature_elements(self, analyzed: AnalyzedFeatures,
+                                  lexical: LexicalFeatures,
                                   persona: PersonaFeatures) -> List[str]:
         """Extract elements that make this creator's style unique."""
+        T = self._thresholds
         elements = []
 
         # Unique vocabulary elements
         if lexical.top_trigrams:
-            unique_trigram = lexical.top_trigrams[0][0]  # Most frequent trigram
-            elements.append(f"Characteristic phrase: '{unique_trigram}'")
+            unique_trigram = lexical.top_trigrams.ngrams[0]  # Most frequent trigram
+            elements.append(_TPL_CHARACTERISTIC_PHRASE(unique_trigram))
 
-        # Discourse markers
-        if lexical.discourse_markers:
-            top_marker = max(lexical.discourse_markers.items(), key=lambda x: x[1])
-            if top_marker[1] > 0.02:
-                elements.append(f"Frequent discourse marker: '{top_marker[0]}'")
+        # Discourse markers (an empty marker dict yields -inf and never passes)
+        top_marker = analyzed.top_marker
+        if top_marker[1] > T.frequent_discourse_marker_rate:
+            elements.append(_TPL_DISCOURSE_MARKER(top_marker[0]))
 
         # Signature expressions
-        for expr in repetition.signature_expressions[:3]:  # Top 3
-            elements.append(f"Recurring expression: '{expr}'")
+        for expr in analyzed.signature_expressions[:3]:  # Top 3
+            elements.append(_TPL_RECURRING_EXPRESSION(expr))
 
         # Enthusiasm markers
-        for marker in persona.enthusiasm_markers[:2]:  # Top 2
-            elements.append(f"Enthusiasm: {marker}")
+        for marker in persona.enthusiasm_markers.to_display_strings()[:2]:  # Top 2
+            if len(elements) >= MAX_SIGNATURE_ELEMENTS:
+                break
+            elements.append(_TPL_ENTHUSIASM(marker))
 
-        return elements[:6]  # Return top 6 elements
+        return elements
 
-    def _determine_communication_archetype(self, syntax: SyntaxFeatures,
+    def _determine_communication_archetype(self, analyzed: AnalyzedFeatures,
+                                         syntax: SyntaxFeatures,
                                          persona: PersonaFeatures,
                                          lexical: LexicalFeatures) -> str:
         """Determine the creator's communication archetype."""
-        # Score different archetypes based on features
-        educator_score = 0
-        entertainer_score = 0
-        motivator_score = 0
-        storyteller_score = 0
-
-        # Educator indicators
-        if syntax.question_frequency > 0.1:
-            educator_score += 2
-        if persona.pov_distribution.get("you", 0) > 0.15:
-            educator_score += 2
-        if syntax.list_usage_frequency > 0.2:
-            educator_score += 1
-
-        # Entertainer indicators
-        if persona.sentiment_distribution.get("positive", 0) > 0.6:
-            entertainer_score += 2
-        if len(persona.enthusiasm_markers) > 2:
-            entertainer_score += 2
-        if lexical.filler_words.get("like", 0) > 0.05:
-            entertainer_score += 1
-
-        # Motivator indicators
-        if syntax.imperative_frequency > 0.08:
-            motivator_score += 2
-        if persona.call_to_action_frequency > 0.01:
-            motivator_score += 2
-        if persona.pov_distribution.get("we", 0) > 0.1:
-            motivator_score += 1
-
-        # Storyteller indicators
-        if syntax.mean_sentence_length > 15:
-            storyteller_score += 1
-        if persona.personal_anecdote_rate > 0.3:
-            storyteller_score += 2
-        if persona.pov_distribution.get("I", 0) > 0.2:
-            storyteller_score += 1
-
-        # Determine archetype
-        scores = {
-            "educator": educator_score,
-            "entertainer": entertainer_score,
-            "motivator": motivator_score,
-            "storyteller": storyteller_score
-        }
-
-        return max(scores.items(), key=lambda x: x[1])[0]
+        T = self._thresholds
+
+        # Indicator flags, in ARCHETYPE_WEIGHTS column order
+        feats = np.array([
+            # Educator indicators
+            analyzed.question_frequency > T.question_rate,
+            analyzed.you_pov > T.educator_you_rate,
+            syntax.list_usage_frequency > T.list_usage_rate,
+            # Entertainer indicators
+            analyzed.positive_sentiment > T.upbeat_positive_rate,
+            analyzed.enthusiasm_categories > T.enthusiastic_marker_categories,
+            lexical.filler_words.get("like", 0) > T.entertainer_like_rate,
+            # Motivator indicators
+            analyzed.imperative_frequency > T.authoritative_imperative_rate,
+            persona.call_to_action_frequency > T.call_to_action_rate,
+            analyzed.we_pov > T.motivator_we_rate,
+            # Storyteller indicators
+            analyzed.mean_sentence_length > T.storyteller_sentence_length,
+            persona.personal_anecdote_rate > T.storyteller_anecdote_rate,
+            analyzed.i_pov > T.storyteller_i_rate,
+        ], dtype=np.int8)
+
+        # Score every archetype at once; argmax keeps the first archetype on ties
+        scores = ARCHETYPE_WEIGHTS @ feats
+        return ARCHETYPES[int(scores.argmax())]
 
     def generate_style_card(self, profile: StyleProfile,
                           creator_name: Optional[str] = None) -> StyleCard:
-        """Generate a human-readable style card from a profile."""
+        """Generate a human-readable style card from a profile (cached per profile)."""
+        key = (profile.creator_id, profile.generation_timestamp, creator_name)
+        cached = self._style_card_cache.get(key)
+        # Profiles can be edited in place, so compare against the snapshot taken at insert time
+        if cached is not None and cached[0] == profile:
+            # Render once on the cached card; every copy handed out reuses the text
+            cached[1].to_prompt_text()
+            return self._copy_style_card(cached[1], profile)
+
+        card = self._build_style_card(profile, creator_name)
+
+        if len(self._style_card_cache) >= STYLE_CARD_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self._style_card_cache[next(iter(self._style_card_cache))]
+        snapshot = copy.deepcopy(profile)
+        self._style_card_cache[key] = (snapshot, self._copy_style_card(card, snapshot))
+
+        return card
+
+    @staticmethod
+    def _copy_style_card(card: StyleCard, profile: StyleProfile) -> StyleCard:
+        """Copy of a card with its own lists and any rendered prompt text, pointing at the given profile."""
+        copied = replace(
+            card,
+            key_patterns=list(card.key_patterns),
+            catchphrases=list(card.catchphrases),
+            formatting_preferences=list(card.formatting_preferences),
+            avoid_patterns=list(card.avoid_patterns),
+            style_profile=profile,
+        )
+        object.__setattr__(copied, '_prompt_text', card._prompt_text)
+        return copied
+
+    def _build_style_card(self, profile: StyleProfile, creator_name: Optional[str]) -> StyleCard:
+        """Run every card extractor over the profile."""
         name = creator_name or f"Creator {profile.creator_id[:8]}"
+        analyzed = self._analyze_profile(profile)
 
         # Generate style summary
-        summary = self._generate_style_summary(profile)
+        summary = self._generate_style_summary(profile, analyzed)
 
         # Extract key patterns
-        key_patterns = self._extract_key_patterns_for_card(profile)
+        key_patterns = self._extract_key_patterns_for_card(profile, analyzed)
 
         # Extract catchphrases
-        catchphrases = profile.repetition.signature_expressions[:5]
+        catchphrases = analyzed.signature_expressions[:5]
 
         # Generate tone description
-        tone_description = self._generate_tone_description(profile)
+        tone_description = self._generate_tone_description(profile, analyzed)
 
         # Extract formatting preferences
-        formatting_prefs = self._extract_formatting_preferences(profile)
+        formatting_prefs = self._extract_formatting_preferences(profile, analyzed)
 
         # Identify what to avoid
-        avoid_patterns = self._identify_avoid_patterns(profile)
+        avoid_patterns = self._identify_avoid_patterns(profile, analyzed)
 
         return StyleCard(
             creator_name=name,
@@ -254,15 +459,16 @@ class StyleProfileGenerator:
             style_profile=profile  # Pass full profile for comprehensive output
         )
 
-    def _generate_style_summary(self, profile: StyleProfile) -> str:
+    def _generate_style_summary(self, profile: StyleProfile, analyzed: AnalyzedFeatures) -> str:
         """Generate a 2-3 sentence style summary."""
+        T = self._thresholds
         archetype = profile.communication_archetype
-        sentence_style = "short, direct sentences" if profile.syntax.mean_sentence_length < 12 else "detailed explanations"
+        sentence_style = "short, direct sentences" if analyzed.mean_sentence_length < T.summary_short_sentence_length else "detailed explanations"
 
         # Identify primary communication trait
-        if profile.persona.pov_distribution.get("you", 0) > 0.1:
+        if analyzed.you_pov > T.direct_you_rate:
             engagement_style = "directly engages with the audience"
-        elif profile.persona.pov_distribution.get("we", 0) > 0.08:
+        elif analyzed.we_pov > T.inclusive_we_rate:
             engagement_style = "builds community through inclusive language"
         else:
             engagement_style = "shares personal insights and experiences"
@@ -275,9 +481,9 @@ class StyleProfileGenerator:
             summary += f"Known for {main_pattern}. "
 
         # Add speaking style
-        if profile.prosody.mean_words_per_minute > 160:
+        if profile.prosody.mean_words_per_minute > T.fast_wpm:
             pace = "energetic, fast-paced delivery"
-        elif profile.prosody.mean_words_per_minute < 120:
+        elif profile.prosody.mean_words_per_minute < T.slow_wpm:
             pace = "thoughtful, measured delivery"
         else:
             pace = "conversational pacing"
@@ -286,153 +492,222 @@ class StyleProfileGenerator:
 
         return summary
 
-    def _extract_key_patterns_for_card(self, profile: StyleProfile) -> List[str]:
+    def _extract_key_patterns_for_card(self, profile: StyleProfile, analyzed: AnalyzedFeatures) -> List[str]:
         """Extract key patterns for the style card."""
+        T = self._thresholds
         patterns = []
 
         # Filler word patterns
         if profile.lexical.filler_words:
-            top_fillers = sorted(profile.lexical.filler_words.items(),
-                               key=lambda x: x[1], reverse=True)[:2]
+            top_fillers = heapq.nlargest(2, profile.lexical.filler_words.items(), key=itemgetter(1))
             for filler, freq in top_fillers:
-                if freq > 0.03:  # More than 3%
-                    patterns.append(f"Uses '{filler}' frequently ({freq:.1%} of speech)")
+                if freq > T.card_filler_rate:
+                    patterns.append(_TPL_CARD_FILLER(filler, freq))
 
         # Sentence structure
-        if profile.syntax.mean_sentence_length < 10:
-            patterns.append("Prefers short, punchy sentences (avg {:.0f} words)".format(
-                profile.syntax.mean_sentence_length))
-        elif profile.syntax.mean_sentence_length > 18:
-            patterns.append("Uses detailed, complex sentences (avg {:.0f} words)".format(
-                profile.syntax.mean_sentence_length))
+        if analyzed.mean_sentence_length < T.short_sentence_length:
+            patterns.append(_TPL_SHORT_SENTENCES(analyzed.mean_sentence_length))
+        elif analyzed.mean_sentence_length > T.card_long_sentence_length:
+            patterns.append(_TPL_LONG_SENTENCES(analyzed.mean_sentence_length))
 
         # Engagement patterns
-        if profile.syntax.question_frequency > 0.1:
-            patterns.append(f"Frequently asks questions ({profile.syntax.question_frequency:.1%} of sentences)")
+        if analyzed.question_frequency > T.question_rate:
+            patterns.append(_TPL_QUESTIONS(analyzed.question_frequency))
 
-        if profile.persona.direct_address_frequency > 0.1:
+        if analyzed.direct_address_frequency > T.direct_address_rate:
             patterns.append("High audience engagement through direct address")
 
         # Speaking pace
         if profile.prosody.mean_words_per_minute > 0:
-            if profile.prosody.mean_words_per_minute > 160:
-                patterns.append(f"Fast-paced delivery ({profile.prosody.mean_words_per_minute:.0f} WPM)")
-            elif profile.prosody.mean_words_per_minute < 120:
-                patterns.append(f"Thoughtful pacing ({profile.prosody.mean_words_per_minute:.0f} WPM)")
+            if profile.prosody.mean_words_per_minute > T.fast_wpm:
+                patterns.append(_TPL_FAST_PACE(profile.prosody.mean_words_per_minute))
+            elif profile.prosody.mean_words_per_minute < T.slow_wpm:
+                patterns.append(_TPL_SLOW_PACE(profile.prosody.mean_words_per_minute))
+
+        if len(patterns) >= MAX_CARD_PATTERNS:
+            return patterns
 
         # Repetition patterns
-        if profile.repetition.word_repetition_rate > 0.2:
+        if analyzed.word_repetition_rate > T.repetition_emphasis_rate:
             patterns.append("Uses repetition for emphasis")
 
-        return patterns[:6]
+        return patterns
 
-    def _generate_tone_description(self, profile: StyleProfile) -> str:
+    def _generate_tone_description(self, profile: StyleProfile, analyzed: AnalyzedFeatures) -> str:
         """Generate a description of the creator's tone."""
+        T = self._thresholds
         tone_elements = []
 
         # Sentiment-based tone
-        if profile.persona.sentiment_distribution.get("positive", 0) > 0.6:
+        if analyzed.positive_sentiment > T.upbeat_positive_rate:
             tone_elements.append("upbeat")
-        elif profile.persona.sentiment_distribution.get("negative", 0) > 0.3:
+        elif analyzed.negative_sentiment > T.critical_negative_rate:
             tone_elements.append("critical")
         else:
             tone_elements.append("balanced")
 
         # Engagement style
-        if profile.persona.direct_address_frequency > 0.1:
+        if analyzed.direct_address_frequency > T.direct_address_rate:
             tone_elements.append("conversational")
 
-        if profile.syntax.imperative_frequency > 0.08:
+        if analyzed.imperative_frequency > T.authoritative_imperative_rate:
             tone_elements.append("authoritative")
 
-        if profile.persona.pov_distribution.get("we", 0) > 0.08:
+        if analyzed.we_pov > T.inclusive_we_rate:
             tone_elements.append("inclusive")
 
+        if len(tone_elements) >= MAX_TONE_ELEMENTS:
+            return ", ".join(tone_elements)
+
         # Enthusiasm level
-        if len(profile.persona.enthusiasm_markers) > 2:
+        if analyzed.enthusiasm_categories > T.enthusiastic_marker_categories:
             tone_elements.append("enthusiastic")
-        elif profile.prosody.mean_words_per_minute < 120:
+        elif profile.prosody.mean_words_per_minute < T.slow_wpm:
             tone_elements.append("measured")
 
+        if len(tone_elements) >= MAX_TONE_ELEMENTS:
+            return ", ".join(tone_elements)
+
         # Formality level
         if profile.lexical.filler_words:
             tone_elements.append("casual")
         else:
             tone_elements.append("polished")
 
-        return ", ".join(tone_elements[:4])
+        return ", ".join(tone_elements)
 
-    def _extract_formatting_preferences(self, profile: StyleProfile) -> List[str]:
+    def _extract_formatting_preferences(self, profile: StyleProfile, analyzed: AnalyzedFeatures) -> List[str]:
         """Extract formatting and structural preferences."""
+        T = self._thresholds
         preferences = []
 
         # List usage
-        if profile.syntax.list_usage_frequency > 0.2:
+        if profile.syntax.list_usage_frequency > T.list_usage_rate:
             preferences.append("Frequently uses lists and bullet points")
 
         # Question usage
-        if profile.syntax.question_frequency > 0.1:
+        if analyzed.question_frequency > T.question_rate:
             preferences.append("Engages audience with questions")
 
         # Sentence structure preference
-        if profile.syntax.sentence_length_distribution.get("short", 0) > 0.5:
+        if profile.syntax.sentence_length_distribution.get("short") > T.concise_short_share:
             preferences.append("Favors concise, digestible content")
-        elif profile.syntax.sentence_length_distribution.get("long", 0) > 0.3:
+        elif profile.syntax.sentence_length_distribution.get("long") > T.detailed_long_share:
             preferences.append("Provides comprehensive, detailed explanations")
 
         # Emphasis patterns
-        if profile.repetition.word_repetition_rate > 0.2:
+        if analyzed.word_repetition_rate > T.repetition_emphasis_rate:
             preferences.append("Uses repetition for emphasis and clarity")
 
+        if len(preferences) >= MAX_FORMATTING_PREFERENCES:
+            return preferences
+
         # Call to action style
-        if profile.persona.call_to_action_frequency > 0.01:
+        if profile.persona.call_to_action_frequency > T.call_to_action_rate:
             preferences.append("Includes clear calls to action")
 
-        return preferences[:4]
+        return preferences
 
-    def _identify_avoid_patterns(self, profile: StyleProfile) -> List[str]:
+    def _identify_avoid_patterns(self, profile: StyleProfile, analyzed: AnalyzedFeatures) -> List[str]:
         """Identify patterns the creator rarely uses."""
+        T = self._thresholds
         avoid_patterns = []
 
         # Things they don't do much
-        if profile.syntax.question_frequency < 0.05:
+        if analyzed.question_frequency < T.rare_question_rate:
             avoid_patterns.append("Rarely asks direct questions")
 
-        if profile.persona.sentiment_distribution.get("negative", 0) < 0.1:
+        if analyzed.negative_sentiment < T.rare_negative_rate:
             avoid_patterns.append("Avoids negative or critical language")
 
-        if profile.lexical.filler_words.get("um", 0) < 0.01:
+        if profile.lexical.filler_words.get("um", 0) < T.rare_hesitation_rate:
             avoid_patterns.append("Minimal use of hesitation markers")
 
-        if profile.syntax.imperative_frequency < 0.03:
+        if len(avoid_patterns) >= MAX_AVOID_PATTERNS:
+            return avoid_patterns
+
+        if analyzed.imperative_frequency < T.rare_imperative_rate:
             avoid_patterns.append("Rarely uses direct commands")
 
-        if profile.persona.personal_anecdote_rate < 0.1:
+        if len(avoid_patterns) >= MAX_AVOID_PATTERNS:
+            return avoid_patterns
+
+        if profile.persona.personal_anecdote_rate < T.rare_anecdote_rate:
             avoid_patterns.append("Limited personal storytelling")
 
-        return avoid_patterns[:3]
+        return avoid_patterns
 
     def save_profile(self, profile: StyleProfile, filepath: str) -> None:
         """Save style profile to JSON file."""
-        profile_dict = asdict(profile)
+        if orjson is not None:
+            # orjson serializes dataclasses natively, without an asdict() copy
+            data = orjson.dumps(
+                profile,
+                default=_json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+            with open(filepath, 'wb') as f:
+                f.write(data)
+            return
 
+        # Encode straight from the dataclasses rather than building an asdict() copy
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(profile_dict, f, indent=2, ensure_ascii=False)
+            json.dump(profile, f, cls=DataclassEncoder, indent=2, ensure_ascii=False)
+
+    def save_profile_async(self, profile: StyleProfile, filepath: str) -> Future:
+        """
+        Save a style profile on a background thread.
+
+        Encoding and disk I/O overlap with whatever the caller does next; call
+        .result() on the returned future to wait for the write and surface errors.
+        The profile must not be modified until the future completes. A single
+        writer thread keeps saves in submission order.
+        """
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-io")
+        return self._io_executor.submit(self.save_profile, profile, filepath)
 
     def load_profile(self, filepath: str) -> StyleProfile:
         """Load style profile from JSON file."""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            profile_dict = json.load(f)
-
-        # Reconstruct the profile object
-        # Note: This is a simplified version; in production you'd want proper deserialization
-        return StyleProfile(**profile_dict)
+        with open(filepath, 'rb') as f:
+            if orjson is None:
+                profile_dict = json.loads(f.read())
+            elif os.fstat(f.fileno()).st_size >= PROFILE_MMAP_THRESHOLD:
+                # Parse straight from the page cache, skipping the copy into a bytes object
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    profile_dict = orjson.loads(view)
+            else:
+                profile_dict = orjson.loads(f.read())
+
+        # Reconstruct the profile object, including nested feature dataclasses
+        return StyleProfile.from_dict(profile_dict)
 
     def export_style_card_text(self, card: StyleCard) -> str:
         """Export style card as formatted text for AI prompting."""
         return card.to_prompt_text()
 
 
+class DataclassEncoder(json.JSONEncoder):
+    """JSON encoder that serializes dataclasses field by field, without a deep copy."""
+
+    def default(self, obj: Any) -> Any:
+        if is_dataclass(obj) and not isinstance(obj, type):
+            # Shallow mapping; the encoder recurses into nested values itself
+            return {f.name: getattr(obj, f.name) for f in fields(obj)}
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+        return super().default(obj)
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values orjson doesn't handle natively (e.g. NumPy scalar subclasses)."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def create_profile_generator(config: Optional[AnalysisConfig] = None) -> StyleProfileGenerator:
     """Factory function to create a profile generator."""
     if config is None:
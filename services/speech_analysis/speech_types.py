@@ -2,13 +2,49 @@
 Type definitions for speech pattern analysis system.
 """
 
-from typing import Dict, List, Optional, Union, Tuple
-from dataclasses import dataclass
+import heapq
+import bisect
+from operator import itemgetter
+from typing import ClassVar, Dict, List, Optional, Union, Tuple
+from dataclasses import dataclass, field, fields, is_dataclass
 from enum import Enum
 
+import numpy as np
 
-class StyleMetric(Enum):
-    """Enumeration of style metrics."""
+
+def _tuple_state(cls):
+    """Pickle a slotted dataclass as a tuple of its slot values in declaration order, without field names."""
+    slots = cls.__slots__
+
+    def __getstate__(self):
+        return tuple([getattr(self, name) for name in slots])
+
+    def __setstate__(self, state):
+        for name, value in zip(slots, state):
+            object.__setattr__(self, name, value)
+
+    cls.__getstate__ = __getstate__
+    cls.__setstate__ = __setstate__
+    return cls
+
+
+def _json_ready(value):
+    """Recursively convert dataclasses and NumPy values into plain JSON-serializable objects."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if is_dataclass(value):
+        return {f.name: _json_ready(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, dict):
+        return {key: _json_ready(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_ready(item) for item in value]
+    return value
+
+
+class StyleMetric(str, Enum):
+    """Enumeration of style metrics. Members are strs, so they hash and compare like their values."""
     LEXICAL_DIVERSITY = "lexical_diversity"
     SENTENCE_LENGTH = "sentence_length"
     FILLER_FREQUENCY = "filler_frequency"
@@ -19,7 +55,8 @@ class StyleMetric(Enum):
     PROSODY_PATTERNS = "prosody_patterns"
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True, frozen=True, repr=False, eq=False)
 class TranscriptSegment:
     """Individual transcript segment with timing and content."""
     video_id: str
@@ -28,14 +65,14 @@ class TranscriptSegment:
     text: str
     confidence: Optional[float] = None
     chunk_index: Optional[int] = None
+    duration: float = field(init=False)  # Seconds; derived from the timestamps
 
-    @property
-    def duration(self) -> float:
-        """Duration of the segment in seconds."""
-        return self.end_time - self.start_time
+    def __post_init__(self):
+        object.__setattr__(self, 'duration', self.end_time - self.start_time)
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True, frozen=True, repr=False, eq=False)
 class ProcessedSegment:
     """Processed transcript segment with cleaned text and features."""
     original: TranscriptSegment
@@ -45,17 +82,136 @@ class ProcessedSegment:
     words_per_minute: float
     pause_before: float = 0.0
     pause_after: float = 0.0
+    tokens: List[str] = field(default_factory=list)  # cleaned_text.split(), reused downstream
+
+    def __post_init__(self):
+        # Segments built without tokens (mocks, direct construction) still get them
+        if not self.tokens and self.cleaned_text:
+            object.__setattr__(self, 'tokens', self.cleaned_text.split())
+
+
+@dataclass(slots=True)
+class ProcessedSegmentBatch:
+    """Column-wise (one array per attribute) view of processed segments for bulk statistics."""
+    word_counts: np.ndarray
+    sentence_counts: np.ndarray
+    wpm: np.ndarray
+    pause_before: np.ndarray
+    pause_after: np.ndarray
+    start_times: np.ndarray
+    end_times: np.ndarray
+    durations: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.word_counts)
+
+    @classmethod
+    def from_segments(cls, segments: List[ProcessedSegment]) -> "ProcessedSegmentBatch":
+        """Build the column arrays from a list of processed segments."""
+        count = len(segments)
+        start_times = np.fromiter((seg.original.start_time for seg in segments), dtype=np.float64, count=count)
+        end_times = np.fromiter((seg.original.end_time for seg in segments), dtype=np.float64, count=count)
+
+        return cls(
+            word_counts=np.fromiter((seg.word_count for seg in segments), dtype=np.int64, count=count),
+            sentence_counts=np.fromiter((len(seg.sentences) for seg in segments), dtype=np.int64, count=count),
+            wpm=np.fromiter((seg.words_per_minute for seg in segments), dtype=np.float64, count=count),
+            pause_before=np.fromiter((seg.pause_before for seg in segments), dtype=np.float64, count=count),
+            pause_after=np.fromiter((seg.pause_after for seg in segments), dtype=np.float64, count=count),
+            start_times=start_times,
+            end_times=end_times,
+            durations=end_times - start_times
+        )
+
+
+@_tuple_state
+@dataclass(slots=True, eq=False)
+class NGramScores:
+    """Top n-grams and their scores as parallel columns, best first."""
+    ngrams: List[str] = field(default_factory=list)
+    scores: np.ndarray = field(default_factory=lambda: np.empty(0))  # float64, aligned with ngrams
+
+    def __len__(self) -> int:
+        return len(self.ngrams)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, NGramScores):
+            return NotImplemented
+        return self.ngrams == other.ngrams and np.array_equal(self.scores, other.scores)
+
+    @classmethod
+    def from_pairs(cls, pairs: List[Tuple[str, float]]) -> "NGramScores":
+        """Build from (ngram, score) pairs, the layout profiles were saved with before."""
+        return cls([ngram for ngram, _ in pairs], np.array([score for _, score in pairs], dtype=np.float64))
+
+
+NGRAM_FIELDS = ('top_bigrams', 'top_trigrams', 'top_4grams', 'top_5grams', 'top_6grams')
+
+
+@_tuple_state
+@dataclass(slots=True, eq=False)
+class BucketShares:
+    """Fixed-width histogram: the share of items in each bucket, in CATEGORIES order."""
+    CATEGORIES: ClassVar[Tuple[str, ...]] = ()
+
+    shares: np.ndarray  # float64, shape (len(CATEGORIES),)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return np.array_equal(self.shares, other.shares)
+
+    def get(self, category: str) -> float:
+        """Share of a single bucket."""
+        return float(self.shares[self.CATEGORIES.index(category)])
+
+    def items(self) -> List[Tuple[str, float]]:
+        """(category, share) pairs in CATEGORIES order."""
+        return list(zip(self.CATEGORIES, self.shares.tolist()))
+
+    @classmethod
+    def empty(cls) -> "BucketShares":
+        """All-zero histogram, used when there is nothing to bucket."""
+        return cls(np.zeros(len(cls.CATEGORIES)))
+
+    @classmethod
+    def from_json(cls, data: Union[Dict, List[float]]) -> "BucketShares":
+        """Build from a saved value: a {"shares": [...]} mapping, or a {category: share} dict from older profiles."""
+        if isinstance(data, dict) and 'shares' in data:
+            data = data['shares']
+        if isinstance(data, dict):
+            data = [data.get(category, 0.0) for category in cls.CATEGORIES]
+        return cls(np.asarray(data, dtype=np.float64))
+
+
+@dataclass(slots=True, eq=False)
+class SentenceLengthDistribution(BucketShares):
+    """Share of sentences that are short (<= 8 words), medium, or long (>= 20 words)."""
+    CATEGORIES = ("short", "medium", "long")
+
+
+@dataclass(slots=True, eq=False)
+class SpeakingRateDistribution(BucketShares):
+    """Share of segments spoken slowly (< 120 wpm), at a normal rate, or fast (> 180 wpm)."""
+    CATEGORIES = ("slow", "normal", "fast")
+
+
+@dataclass(slots=True, eq=False)
+class PauseDistribution(BucketShares):
+    """Share of pauses that are short (< 1s), medium, or long (> 3s)."""
+    CATEGORIES = ("short", "medium", "long")
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True)
 class LexicalFeatures:
     """Lexical analysis features."""
-    # N-gram patterns
-    top_bigrams: List[Tuple[str, float]]  # (bigram, pmi_score)
-    top_trigrams: List[Tuple[str, float]]
-    top_4grams: List[Tuple[str, float]]
-    top_5grams: List[Tuple[str, float]]
-    top_6grams: List[Tuple[str, float]]
+    # N-gram patterns (pmi_score per n-gram)
+    top_bigrams: NGramScores
+    top_trigrams: NGramScores
+    top_4grams: NGramScores
+    top_5grams: NGramScores
+    top_6grams: NGramScores
 
     # Function words and fillers
     filler_words: Dict[str, float]  # word -> frequency
@@ -69,13 +225,14 @@ class LexicalFeatures:
     rare_word_frequency: float
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True)
 class SyntaxFeatures:
     """Syntactic and discourse pattern features."""
     # Sentence structure
     mean_sentence_length: float
     sentence_length_variance: float
-    sentence_length_distribution: Dict[str, float]  # "short", "medium", "long"
+    sentence_length_distribution: SentenceLengthDistribution
 
     # POS tag distributions
     pos_distribution: Dict[str, float]
@@ -89,7 +246,8 @@ class SyntaxFeatures:
     list_usage_frequency: float
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True)
 class RepetitionFeatures:
     """Repetition and emphasis patterns."""
     # Intra-sentence repetition
@@ -105,36 +263,119 @@ class RepetitionFeatures:
     signature_expressions: List[str]
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True)
 class ProsodyFeatures:
     """Prosodic patterns derived from timing data."""
     # Speaking rate
     mean_words_per_minute: float
     wpm_variance: float
-    speaking_rate_distribution: Dict[str, float]  # "fast", "normal", "slow"
+    speaking_rate_distribution: SpeakingRateDistribution
 
     # Pause patterns
     pause_frequency: float
     mean_pause_duration: float
-    pause_distribution: Dict[str, float]  # by duration categories
+    pause_distribution: PauseDistribution
 
     # Rhythm and flow
     speech_continuity_score: float
     rhythm_regularity: float
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True)
+class EnthusiasmMarkers:
+    """Raw enthusiasm marker counts; formatted for display only on demand."""
+    exclamations: int = 0
+    enthusiasm_words: List[str] = field(default_factory=list)
+    caps_count: int = 0
+
+    @property
+    def category_count(self) -> int:
+        """Number of marker categories present in the text."""
+        return (
+            (self.exclamations > 0)
+            + bool(self.enthusiasm_words)
+            + (self.caps_count > 0)
+        )
+
+    @classmethod
+    def from_display_strings(cls, markers: List[str]) -> "EnthusiasmMarkers":
+        """Parse the display strings profiles were saved with before markers were stored as counts."""
+        result = cls()
+        for marker in markers:
+            if marker.startswith("Exclamation points ("):
+                result.exclamations = int(marker[len("Exclamation points ("):-1])
+            elif marker.startswith("Enthusiasm words: "):
+                result.enthusiasm_words = marker[len("Enthusiasm words: "):].split(", ")
+            elif marker.startswith("Caps for emphasis: "):
+                result.caps_count = int(marker[len("Caps for emphasis: "):].split()[0])
+        return result
+
+    def to_display_strings(self) -> List[str]:
+        """Human-readable description of each marker category present."""
+        markers = []
+        if self.exclamations > 0:
+            markers.append(f"Exclamation points ({self.exclamations})")
+        if self.enthusiasm_words:
+            markers.append(f"Enthusiasm words: {', '.join(self.enthusiasm_words)}")
+        if self.caps_count > 0:
+            markers.append(f"Caps for emphasis: {self.caps_count} instances")
+        return markers
+
+
+@_tuple_state
+@dataclass(slots=True)
+class POVDistribution:
+    """Share of pronouns by point of view."""
+    CATEGORIES: ClassVar[Tuple[str, ...]] = ("I", "you", "we", "they")
+
+    I: float = 0.0
+    you: float = 0.0
+    we: float = 0.0
+    they: float = 0.0
+
+    def values(self) -> Tuple[float, ...]:
+        """Shares in CATEGORIES order."""
+        return (self.I, self.you, self.we, self.they)
+
+    def items(self) -> List[Tuple[str, float]]:
+        """(category, share) pairs in CATEGORIES order."""
+        return list(zip(self.CATEGORIES, self.values()))
+
+
+@_tuple_state
+@dataclass(slots=True)
+class SentimentDistribution:
+    """Share of words by sentiment polarity."""
+    CATEGORIES: ClassVar[Tuple[str, ...]] = ("positive", "negative", "neutral")
+
+    positive: float = 0.0
+    negative: float = 0.0
+    neutral: float = 0.0
+
+    def values(self) -> Tuple[float, ...]:
+        """Shares in CATEGORIES order."""
+        return (self.positive, self.negative, self.neutral)
+
+    def items(self) -> List[Tuple[str, float]]:
+        """(category, share) pairs in CATEGORIES order."""
+        return list(zip(self.CATEGORIES, self.values()))
+
+
+@_tuple_state
+@dataclass(slots=True)
 class PersonaFeatures:
     """Persona and communication style features."""
-    # Point of view usage
-    pov_distribution: Dict[str, float]  # "I", "you", "we", "they"
+    # Point of view usage; None when there was no text to analyze
+    pov_distribution: Optional[POVDistribution]
     direct_address_frequency: float
     inclusive_language_rate: float
 
-    # Sentiment and emotion
-    sentiment_distribution: Dict[str, float]  # "positive", "negative", "neutral"
+    # Sentiment and emotion; None when there was no text to analyze
+    sentiment_distribution: Optional[SentimentDistribution]
     emotional_intensity: float
-    enthusiasm_markers: List[str]
+    enthusiasm_markers: EnthusiasmMarkers
 
     # Engagement patterns
     question_to_audience: float
@@ -142,7 +383,8 @@ class PersonaFeatures:
     personal_anecdote_rate: float
 
 
-@dataclass
+@_tuple_state
+@dataclass(slots=True)
 class StyleProfile:
     """Complete style profile for a creator."""
     creator_id: str
@@ -167,8 +409,49 @@ class StyleProfile:
     total_duration_minutes: float
     confidence_score: float  # Overall confidence in the analysis
 
-
-@dataclass
+    def to_dict(self) -> Dict:
+        """JSON-ready dict of the profile (NumPy arrays as lists), the inverse of from_dict."""
+        return _json_ready(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StyleProfile":
+        """Rebuild a profile, including its nested feature dataclasses, from a JSON dict."""
+        lexical = dict(data['lexical'])
+        for key in NGRAM_FIELDS:
+            ngrams = lexical[key]
+            lexical[key] = NGramScores(ngrams['ngrams'], np.asarray(ngrams['scores'], dtype=np.float64)) \
+                if isinstance(ngrams, dict) else NGramScores.from_pairs(ngrams)
+
+        persona = dict(data['persona'])
+        persona['pov_distribution'] = (
+            POVDistribution(**persona['pov_distribution']) if persona['pov_distribution'] else None)
+        persona['sentiment_distribution'] = (
+            SentimentDistribution(**persona['sentiment_distribution'])
+            if persona['sentiment_distribution'] else None)
+        markers = persona['enthusiasm_markers']
+        persona['enthusiasm_markers'] = EnthusiasmMarkers(**markers) if isinstance(markers, dict) \
+            else EnthusiasmMarkers.from_display_strings(markers)
+
+        syntax = dict(data['syntax'])
+        syntax['sentence_length_distribution'] = SentenceLengthDistribution.from_json(
+            syntax['sentence_length_distribution'])
+
+        prosody = dict(data['prosody'])
+        prosody['speaking_rate_distribution'] = SpeakingRateDistribution.from_json(
+            prosody['speaking_rate_distribution'])
+        prosody['pause_distribution'] = PauseDistribution.from_json(prosody['pause_distribution'])
+
+        return cls(**{
+            **data,
+            'lexical': LexicalFeatures(**lexical),
+            'syntax': SyntaxFeatures(**syntax),
+            'repetition': RepetitionFeatures(**data['repetition']),
+            'prosody': ProsodyFeatures(**prosody),
+            'persona': PersonaFeatures(**persona),
+        })
+
+
+@dataclass(slots=True)
 class StyleScore:
     """Style similarity scoring result."""
     overall_score: float  # 0-1 similarity score
@@ -177,7 +460,64 @@ class StyleScore:
     recommendations: List[str]  # Suggestions to improve style match
 
 
-@dataclass
+# Style card prompt templates, filled with str.format_map
+_COMPREHENSIVE_PROMPT_TEMPLATE = """# {creator_name}'s AI Style Profile
+
+**Profile Generated:** {generated} UTC
+**Analysis Confidence:** {confidence_score:.1%}
+**Content Analyzed:** {total_words:,} words from {total_segments} segments
+**Total Duration:** {total_duration:.1f} minutes
+
+## 🎯 Communication Archetype
+**Primary Style:** {archetype_title}
+**Tone:** {tone}
+
+{style_summary}
+
+## 📊 Speaking Metrics
+- **Speaking Rate:** {wpm:.1f} words per minute
+- **Sentence Length:** {sentence_length:.1f} words average
+- **Question Frequency:** {question_frequency:.1%} of sentences
+- **Lexical Diversity:** {type_token_ratio:.1%} (vocabulary richness)
+
+{catchphrases_section}## 💬 Communication Patterns
+{key_patterns}{pov_line}
+{formatting_section}{avoid_section}## 🤖 AI Response Guidelines
+
+**When responding as this creator:**
+- Match the {archetype} archetype with {tone} tone
+- Use approximately {wpm:.0f} WPM pacing in voice responses
+- Keep sentences around {sentence_length:.0f} words average
+- Ask questions {question_frequency:.1%} of the time to maintain engagement
+{guideline_extras}
+**Voice and Delivery:**
+- Energy Level: {energy_level}
+- Sentence Variety: {sentence_variety}
+- Audience Interaction: {interaction}"""
+
+_BASIC_PROMPT_TEMPLATE = (
+    "**{creator_name}'s Communication Style:**\n"
+    "{style_summary}\n"
+    "\n"
+    "**Key Patterns:**{key_patterns}{catchphrases_section}{formatting_section}"
+)
+
+# Descriptor buckets: bisect over the ascending cut points picks the label.
+# bisect_left puts values equal to a cut point in the lower bucket (strict ">" checks),
+# bisect_right puts them in the upper bucket (strict "<" checks).
+_ENERGY_CUTS, _ENERGY_LEVELS = (120, 160), ("Measured", "Moderate", "High")
+_INTERACTION_CUTS, _INTERACTION_LEVELS = (0.08, 0.15), (
+    "Primarily informational", "Moderately interactive", "Highly interactive")
+_SENTENCE_VARIETY_CUTS, _SENTENCE_VARIETIES = (12,), ("Concise and punchy", "Detailed and comprehensive")
+
+
+def _bullet_lines(items: List[str]) -> str:
+    """Markdown bullet list, one newline-terminated line per item."""
+    return "".join([f"- {item}\n" for item in items])
+
+
+@_tuple_state
+@dataclass(slots=True, frozen=True)
 class StyleCard:
     """Human-readable style summary for AI prompts."""
     creator_name: str
@@ -188,151 +528,110 @@ class StyleCard:
     formatting_preferences: List[str]  # Structural preferences
     avoid_patterns: List[str]  # What the creator rarely does
     style_profile: Optional['StyleProfile'] = None  # Reference to full profile for detailed output
+    _prompt_text: Optional[str] = field(default=None, init=False, repr=False, compare=False)  # Rendered once
 
     def to_prompt_text(self) -> str:
         """Convert to text suitable for AI model prompting."""
-        # If we have access to the full profile, generate comprehensive output
-        if self.style_profile:
-            return self._generate_comprehensive_prompt()
-
-        # Fallback to basic format if no profile available
-        return self._generate_basic_prompt()
+        if self._prompt_text is None:
+            # If we have access to the full profile, generate comprehensive output;
+            # fall back to the basic format if no profile is available
+            text = self._generate_comprehensive_prompt() if self.style_profile \
+                else self._generate_basic_prompt()
+            object.__setattr__(self, '_prompt_text', text)
+        return self._prompt_text
 
     def _generate_comprehensive_prompt(self) -> str:
         """Generate comprehensive style card with detailed metrics."""
         profile = self.style_profile
+        syntax = profile.syntax
+        wpm = profile.prosody.mean_words_per_minute
+        question_frequency = syntax.question_frequency
 
-        prompt_parts = [
-            f"# {self.creator_name}'s AI Style Profile",
-            "",
-            f"**Profile Generated:** {profile.generation_timestamp[:19].replace('T', ' ')} UTC",
-            f"**Analysis Confidence:** {profile.confidence_score:.1%}",
-            f"**Content Analyzed:** {profile.total_words_analyzed:,} words from {profile.total_segments_analyzed} segments",
-            f"**Total Duration:** {profile.total_duration_minutes:.1f} minutes",
-            "",
-            "## 🎯 Communication Archetype",
-            f"**Primary Style:** {profile.communication_archetype.title()}",
-            f"**Tone:** {self.tone_description}",
-            "",
-            self.style_summary,
-            "",
-            "## 📊 Speaking Metrics",
-            f"- **Speaking Rate:** {profile.prosody.mean_words_per_minute:.1f} words per minute",
-            f"- **Sentence Length:** {profile.syntax.mean_sentence_length:.1f} words average",
-            f"- **Question Frequency:** {profile.syntax.question_frequency:.1%} of sentences",
-            f"- **Lexical Diversity:** {profile.lexical.type_token_ratio:.1%} (vocabulary richness)",
-            ""
-        ]
-
-        # Add signature phrases with counts
+        # Optional sections, each carrying its own trailing newlines
+        catchphrases_section = ""
         if self.catchphrases:
-            prompt_parts.extend([
-                "## 🔤 Signature Phrases",
-                f"**Top Expressions:** {', '.join(self.catchphrases[:5])}"
-            ])
-
-            # Add frequent words/fillers if available
+            fillers_line = ""
             if profile.lexical.filler_words:
-                top_fillers = sorted(profile.lexical.filler_words.items(), key=lambda x: x[1], reverse=True)[:3]
+                top_fillers = heapq.nlargest(3, profile.lexical.filler_words.items(), key=itemgetter(1))
                 filler_text = ", ".join([f"'{word}' ({freq:.1%})" for word, freq in top_fillers if freq > 0.02])
                 if filler_text:
-                    prompt_parts.append(f"**Frequent Words:** {filler_text}")
-
-            prompt_parts.append("")
-
-        # Communication patterns
-        prompt_parts.extend([
-            "## 💬 Communication Patterns"
-        ])
-
-        for pattern in self.key_patterns:
-            prompt_parts.append(f"- {pattern}")
-
-        # Point of view usage
-        if profile.persona.pov_distribution:
-            pov_items = [(pov, freq) for pov, freq in profile.persona.pov_distribution.items() if freq > 0.05]
-            if pov_items:
-                pov_text = ", ".join([f"'{pov}' ({freq:.1%})" for pov, freq in sorted(pov_items, key=lambda x: x[1], reverse=True)])
-                prompt_parts.append(f"- **Pronoun Usage:** {pov_text}")
-
-        prompt_parts.append("")
-
-        # Formatting preferences
+                    fillers_line = f"**Frequent Words:** {filler_text}\n"
+            catchphrases_section = (
+                f"## 🔤 Signature Phrases\n"
+                f"**Top Expressions:** {', '.join(self.catchphrases[:5])}\n"
+                f"{fillers_line}\n"
+            )
+
+        pov_line = ""
+        pov_dist = profile.persona.pov_distribution or POVDistribution()
+        pov_items = [(pov, freq) for pov, freq in pov_dist.items() if freq > 0.05]
+        if pov_items:
+            pov_text = ", ".join([f"'{pov}' ({freq:.1%})" for pov, freq in heapq.nlargest(len(pov_items), pov_items, key=itemgetter(1))])
+            pov_line = f"- **Pronoun Usage:** {pov_text}\n"
+
+        formatting_section = ""
         if self.formatting_preferences:
-            prompt_parts.extend([
-                "## 📝 Content Structure Preferences"
-            ])
-            for pref in self.formatting_preferences:
-                prompt_parts.append(f"- {pref}")
-            prompt_parts.append("")
-
-        # What to avoid
-        if self.avoid_patterns:
-            prompt_parts.extend([
-                "## ❌ Patterns to Avoid"
-            ])
-            for pattern in self.avoid_patterns:
-                prompt_parts.append(f"- {pattern}")
-            prompt_parts.append("")
-
-        # AI Prompting Guidelines
-        prompt_parts.extend([
-            "## 🤖 AI Response Guidelines",
-            "",
-            "**When responding as this creator:**",
-            f"- Match the {profile.communication_archetype} archetype with {self.tone_description} tone",
-            f"- Use approximately {profile.prosody.mean_words_per_minute:.0f} WPM pacing in voice responses",
-            f"- Keep sentences around {profile.syntax.mean_sentence_length:.0f} words average",
-            f"- Ask questions {profile.syntax.question_frequency:.1%} of the time to maintain engagement"
-        ])
-
-        # Add specific phrase usage if available
-        if self.catchphrases:
-            prompt_parts.append(f"- Naturally incorporate signature phrases: {', '.join(self.catchphrases[:3])}")
+            formatting_section = "## 📝 Content Structure Preferences\n" + _bullet_lines(self.formatting_preferences) + "\n"
 
-        # Add communication style specifics
-        if profile.persona.pov_distribution.get("you", 0) > 0.1:
-            prompt_parts.append("- Use direct audience engagement with 'you' language")
-
-        if profile.syntax.imperative_frequency > 0.08:
-            prompt_parts.append("- Include actionable advice and direct instructions")
-
-        prompt_parts.extend([
-            "",
-            "**Voice and Delivery:**",
-            f"- Energy Level: {'High' if profile.prosody.mean_words_per_minute > 160 else 'Moderate' if profile.prosody.mean_words_per_minute > 120 else 'Measured'}",
-            f"- Sentence Variety: {'Concise and punchy' if profile.syntax.mean_sentence_length < 12 else 'Detailed and comprehensive'}",
-            f"- Audience Interaction: {'Highly interactive' if profile.syntax.question_frequency > 0.15 else 'Moderately interactive' if profile.syntax.question_frequency > 0.08 else 'Primarily informational'}"
-        ])
+        avoid_section = ""
+        if self.avoid_patterns:
+            avoid_section = "## ❌ Patterns to Avoid\n" + _bullet_lines(self.avoid_patterns) + "\n"
 
-        return "\n".join(prompt_parts)
+        guideline_extras = ""
+        if self.catchphrases:
+            guideline_extras += f"- Naturally incorporate signature phrases: {', '.join(self.catchphrases[:3])}\n"
+        if pov_dist.you > 0.1:
+            guideline_extras += "- Use direct audience engagement with 'you' language\n"
+        if syntax.imperative_frequency > 0.08:
+            guideline_extras += "- Include actionable advice and direct instructions\n"
+
+        return _COMPREHENSIVE_PROMPT_TEMPLATE.format_map({
+            'creator_name': self.creator_name,
+            'generated': profile.generation_timestamp[:19].replace('T', ' '),
+            'confidence_score': profile.confidence_score,
+            'total_words': profile.total_words_analyzed,
+            'total_segments': profile.total_segments_analyzed,
+            'total_duration': profile.total_duration_minutes,
+            'archetype': profile.communication_archetype,
+            'archetype_title': profile.communication_archetype.title(),
+            'tone': self.tone_description,
+            'style_summary': self.style_summary,
+            'wpm': wpm,
+            'sentence_length': syntax.mean_sentence_length,
+            'question_frequency': question_frequency,
+            'type_token_ratio': profile.lexical.type_token_ratio,
+            'catchphrases_section': catchphrases_section,
+            'key_patterns': _bullet_lines(self.key_patterns),
+            'pov_line': pov_line,
+            'formatting_section': formatting_section,
+            'avoid_section': avoid_section,
+            'guideline_extras': guideline_extras,
+            'energy_level': _ENERGY_LEVELS[bisect.bisect_left(_ENERGY_CUTS, wpm)],
+            'sentence_variety': _SENTENCE_VARIETIES[
+                bisect.bisect_right(_SENTENCE_VARIETY_CUTS, syntax.mean_sentence_length)],
+            'interaction': _INTERACTION_LEVELS[bisect.bisect_left(_INTERACTION_CUTS, question_frequency)],
+        })
 
     def _generate_basic_prompt(self) -> str:
         """Generate basic style card format for backward compatibility."""
-        prompt_parts = [
-            f"**{self.creator_name}'s Communication Style:**",
-            self.style_summary,
-            "",
-            "**Key Patterns:**"
-        ]
-
-        for pattern in self.key_patterns:
-            prompt_parts.append(f"- {pattern}")
-
+        catchphrases_section = ""
         if self.catchphrases:
-            prompt_parts.extend(["", "**Signature Phrases:**"])
-            prompt_parts.append(f"- {', '.join(self.catchphrases[:5])}")
+            catchphrases_section = f"\n\n**Signature Phrases:**\n- {', '.join(self.catchphrases[:5])}"
 
+        formatting_section = ""
         if self.formatting_preferences:
-            prompt_parts.extend(["", "**Communication Style:**"])
-            for pref in self.formatting_preferences:
-                prompt_parts.append(f"- {pref}")
-
-        return "\n".join(prompt_parts)
+            formatting_section = "\n\n**Communication Style:**\n" + _bullet_lines(self.formatting_preferences)[:-1]
 
+        return _BASIC_PROMPT_TEMPLATE.format_map({
+            'creator_name': self.creator_name,
+            'style_summary': self.style_summary,
+            'key_patterns': "".join([f"\n- {pattern}" for pattern in self.key_patterns]),
+            'catchphrases_section': catchphrases_section,
+            'formatting_section': formatting_section,
+        })
 
 # Database integration types
-@dataclass
+@dataclass(slots=True)
 class CreatorTranscriptData:
     """Transcript data retrieved from database for a creator."""
     creator_id: str
@@ -343,7 +642,7 @@ class CreatorTranscriptData:
 
 
 # Configuration types
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisConfig:
     """Configuration for speech analysis."""
     min_segment_duration: float = 1.0  # Minimum segment duration in seconds
@@ -353,4 +652,8 @@ class AnalysisConfig:
     rare_word_threshold: float = 0.001  # Threshold for rare words
     confidence_threshold: float = 0.7  # Minimum confidence for including segments
     enable_punctuation_restoration: bool = True
-    language: str = "en"
\ No newline at end of file
+    quantize_punctuation_model: bool = True  # Int8 dynamic quantization for CPU inference
+    language: str = "en"
+    # Opt-in on-disk preprocessing cache (None disables). Entries are unpickled on
+    # read, so only point this at a directory no one else can write to.
+    cache_dir: Optional[str] = None
\ No newline at end of file
@@ -4,15 +4,21 @@ Test script for the speech analysis system.
 Tests the system with sample data and real creator data.
 """
 
+import io
 import sys
 import os
 import json
-from typing import List
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Any, Callable, List, Tuple
 
 # Add the parent directory to the path so we can import the modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from speech_types import TranscriptSegment, AnalysisConfig
+from speech_types import TranscriptSegment, AnalysisConfig, StyleProfile, NGRAM_FIELDS
+from sample_data import layout_sample_segments
 from preprocess import create_preprocessor
 from features import FeatureExtractor
 from speech_profile import create_profile_generator
@@ -34,27 +40,7 @@ def create_sample_segments() -> List[TranscriptSegment]:
         "Alright, let's taste test this bad boy. Mmm, oh my god, that's incredible! The seasoning is perfect, the texture is spot on."
     ]
 
-    segments = []
-    start_time = 0.0
-
-    for i, text in enumerate(sample_texts):
-        # Estimate duration based on text length (roughly 2.5 words per second)
-        word_count = len(text.split())
-        duration = word_count / 2.5
-        end_time = start_time + duration
-
-        segment = TranscriptSegment(
-            video_id=f"test_video_{i // 3 + 1}",  # Group into videos
-            start_time=start_time,
-            end_time=end_time,
-            text=text,
-            confidence=0.95
-        )
-        segments.append(segment)
-
-        start_time = end_time + 1.0  # 1-second gap between segments
-
-    return segments
+    return layout_sample_segments(sample_texts, "test_video")
 
 
 def test_preprocessing():
@@ -101,8 +87,7 @@ def test_feature_extraction(processed_segments):
         top_filler = max(lexical.filler_words.items(), key=lambda x: x[1])
         print(f"   Top filler word: '{top_filler[0]}' ({top_filler[1]:.1%})")
 
-    if persona.pov_distribution:
-        print(f"   POV distribution: {dict(persona.pov_distribution)}")
+    print(f"   POV distribution: {dict(persona.pov_distribution.items()) if persona.pov_distribution else {}}")
 
     return lexical, syntax, repetition, prosody, persona
 
@@ -161,6 +146,60 @@ def test_style_scoring(profile):
     return True
 
 
+def test_database_payload(profile):
+    """Test that the style profile payload sent to the database is plain JSON."""
+    print("🧾 Testing database payload serialization...")
+
+    payload = json.dumps(profile.to_dict())
+    data = json.loads(payload)
+    restored = StyleProfile.from_dict(data)
+
+    # NumPy-backed histograms must arrive as plain lists of shares
+    histograms = {
+        'sentence_length_distribution': data['syntax']['sentence_length_distribution'],
+        'speaking_rate_distribution': data['prosody']['speaking_rate_distribution'],
+        'pause_distribution': data['prosody']['pause_distribution'],
+    }
+    for name, histogram in histograms.items():
+        assert isinstance(histogram['shares'], list), f"{name} was not serialized as a list"
+
+    assert restored == profile, "Database payload did not round-trip to the same profile"
+    print(f"   Payload serialized to {len(payload):,} bytes and round-trips")
+
+    return True
+
+
+def test_legacy_profile_loading(profile):
+    """Test loading a profile saved in the original JSON layout."""
+    print("🗂️  Testing legacy profile loading...")
+
+    generator = create_profile_generator(AnalysisConfig())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "profile.json")
+        generator.save_profile(profile, path)
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        # Rewrite the fields whose layout changed the way older profiles stored them
+        for key in NGRAM_FIELDS:
+            ngrams = data['lexical'][key]
+            data['lexical'][key] = [list(pair) for pair in zip(ngrams['ngrams'], ngrams['scores'])]
+        data['syntax']['sentence_length_distribution'] = dict(profile.syntax.sentence_length_distribution.items())
+        for key in ('speaking_rate_distribution', 'pause_distribution'):
+            data['prosody'][key] = dict(getattr(profile.prosody, key).items())
+        data['persona']['enthusiasm_markers'] = profile.persona.enthusiasm_markers.to_display_strings()
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        loaded = generator.load_profile(path)
+
+    assert loaded == profile, "Legacy-format profile did not load back to the same profile"
+    print("   Legacy-format profile loaded and matches the original")
+
+    return True
+
+
 def test_with_database_data():
     """Test with real database data if available."""
     print("🗃️  Testing with database data...")
@@ -225,13 +264,21 @@ def test_with_database_data():
         return False
 
 
+def _run_captured(func: Callable, *args) -> Tuple[str, Any]:
+    """Run a test in a worker process, returning its printed output with its result."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = func(*args)
+    return buffer.getvalue(), result
+
+
 def main():
     """Run all tests."""
     print("🚀 Starting Speech Analysis System Tests")
     print("=" * 60)
 
     try:
-        # Test 1: Preprocessing
+        # Test 1: Preprocessing (every later stage depends on its output)
         processed_segments = test_preprocessing()
         if not processed_segments:
             print("❌ Preprocessing test failed")
@@ -239,24 +286,43 @@ def main():
 
         print("✅ Preprocessing test passed\n")
 
-        # Test 2: Feature Extraction
-        features = test_feature_extraction(processed_segments)
-        print("✅ Feature extraction test passed\n")
-
-        # Test 3: Profile Generation
-        profile, style_card = test_profile_generation(processed_segments)
-        print("✅ Profile generation test passed\n")
-
-        # Test 4: Style Scoring
-        test_style_scoring(profile)
-        print("✅ Style scoring test passed\n")
-
-        # Test 5: Database Integration (if available)
-        db_success = test_with_database_data()
-        if db_success:
-            print("✅ Database integration test passed\n")
-        else:
-            print("⚠️  Database integration test skipped (no data or connection)\n")
+        # Tests 2, 3 and 7 are independent, so run them concurrently. Each worker's
+        # output is captured and printed in stage order once it finishes. Workers are
+        # spawned rather than forked, since the parent may already hold model threads.
+        with ProcessPoolExecutor(max_workers=3, mp_context=multiprocessing.get_context("spawn")) as executor:
+            features_run = executor.submit(_run_captured, test_feature_extraction, processed_segments)
+            profile_run = executor.submit(_run_captured, test_profile_generation, processed_segments)
+            db_run = executor.submit(_run_captured, test_with_database_data)
+
+            # Test 2: Feature Extraction
+            output, features = features_run.result()
+            print(output, end="")
+            print("✅ Feature extraction test passed\n")
+
+            # Test 3: Profile Generation
+            output, (profile, style_card) = profile_run.result()
+            print(output, end="")
+            print("✅ Profile generation test passed\n")
+
+            # Test 4: Style Scoring (tests 4-6 need the profile, so they run here while test 7 finishes)
+            test_style_scoring(profile)
+            print("✅ Style scoring test passed\n")
+
+            # Test 5: Database payload serialization
+            test_database_payload(profile)
+            print("✅ Database payload test passed\n")
+
+            # Test 6: Legacy profile loading
+            test_legacy_profile_loading(profile)
+            print("✅ Legacy profile loading test passed\n")
+
+            # Test 7: Database Integration (if available)
+            output, db_success = db_run.result()
+            print(output, end="")
+            if db_success:
+                print("✅ Database integration test passed\n")
+            else:
+                print("⚠️  Database integration test skipped (no data or connection)\n")
 
         # Display sample style card
         print("📋 Sample Style Card Output:")